@@ -25,117 +25,354 @@ Patterns supported:
 import re
 import sys
 import os
-from pathlib import Path
-from typing import List, Dict, Optional
+import bisect
+import io
+import functools
+import itertools
+from collections import OrderedDict, deque, namedtuple
+from typing import List, Dict, Optional, Pattern, Tuple
 
 # print("Executing springbootplusplus_data_core/extract_id_fields.py")
 
 # Add parent directory to path for imports
 script_dir = os.path.dirname(os.path.abspath(__file__))
 parent_scripts_dir = os.path.dirname(script_dir)
-sys.path.insert(0, parent_scripts_dir)
+if parent_scripts_dir not in sys.path:
+    sys.path.insert(0, parent_scripts_dir)
 
-# Try to import from local serialization scripts
-try:
+# The local serialization scripts used when available (see _load_serialization_lib)
+SerializationLib = namedtuple('SerializationLib', 'S1_check_dto_macro S2_extract_dto_fields S6_discover_validation_macros')
+
+
+@functools.lru_cache(maxsize=1)
+def _load_serialization_lib() -> Optional[SerializationLib]:
+    """
+    Import the local serialization scripts on first use.
+    
+    Returns:
+        SerializationLib with the S1, S2 and S6 modules, or None if they are not available
+        (the fallback implementations below are used instead)
+    """
     # Find local serialization scripts directory
-    serialization_dir = Path(script_dir) / "serialization"
-    if serialization_dir.exists():
-        sys.path.insert(0, str(serialization_dir))
+    serialization_dir = os.path.join(script_dir, "serialization")
+    if not os.path.exists(serialization_dir):
+        return None
+    if serialization_dir not in sys.path:
+        sys.path.insert(0, serialization_dir)
+    
+    try:
+        import S1_check_dto_macro
+        import S2_extract_dto_fields
+        import S6_discover_validation_macros
+    except ImportError as e:
+        return None
+    return SerializationLib(S1_check_dto_macro, S2_extract_dto_fields, S6_discover_validation_macros)
+
+
+# Precompiled patterns (compiled once at import instead of per line)
+_CLASS_RE = re.compile(r'class\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:[:{])')
+_ID_ANNOT_RE = re.compile(r'/\*\s*@Id\s*\*/')
+# Same as _ID_ANNOT_RE, but never matches across lines (used to scan whole class text)
+_ID_ANNOT_LINE_RE = re.compile(r'/\*[^\S\n]*@Id[^\S\n]*\*/')
+_ID_PROCESSED_RE = re.compile(r'/\*--\s*@Id\s*--\*/')
+# Matches: "int rollNo;", "StdString name;", "const long digit;", etc.
+# The quantifiers whose backtracking can never produce another match are possessive
+# (Python 3.11+), which keeps long template-heavy lines from backtracking quadratically.
+try:
+    _FIELD_RE = re.compile(r'^\s*+(?:Public|Private|Protected)?\s*(?:const\s+)?([A-Za-z_][A-Za-z0-9_<>*&,\s]*?)\s++([A-Za-z_][A-Za-z0-9_]*+)\s*+[;=]')
+except re.error:
+    _FIELD_RE = re.compile(r'^\s*(?:Public|Private|Protected)?\s*(?:const\s+)?([A-Za-z_][A-Za-z0-9_<>*&,\s]*?)\s+([A-Za-z_][A-Za-z0-9_]*)\s*[;=]')
+_ACCESS_RE = re.compile(r'^\s*(public|private|protected)\s*:', re.IGNORECASE)
+_STOP_RE = re.compile(r'^\s*(Dto|Serializable|_Entity|COMPONENT|SCOPE|VALIDATE|///\s*@(Id|Entity|Serializable|NotNull|NotEmpty|NotBlank))\s*$')
+# Lines starting with these are comments and are ignored when looking for the class and counting braces
+_COMMENT_PREFIXES = ('//', '/*', '*')
+
+# A file read once and classified line by line, shared by the helpers below instead of
+# each of them re-stripping and re-classifying the lines:
+#   raw: whole text; lines: its lines (with line endings); stripped: each line stripped;
+#   line_starts: offset of each line in raw, followed by the total length;
+#   is_comment: whether the stripped line starts with one of _COMMENT_PREFIXES;
+#   brace_delta: count of '{' minus count of '}' on the line;
+#   brace_lines: indexes of the non-comment lines whose brace_delta is not zero
+ParsedSource = namedtuple('ParsedSource', 'raw lines stripped line_starts is_comment brace_delta brace_lines')
+
+# Parsed files keyed by absolute path, each stored with the (mtime_ns, size) it was read at
+_SOURCE_CACHE = OrderedDict()
+_SOURCE_CACHE_SIZE = 128
+
+
+def _get_annotation_name(serializable_macro: str) -> str:
+    """Map a macro name to its annotation (Serializable -> @Serializable, _Entity -> @Entity)."""
+    if serializable_macro == "_Entity":
+        return "@Entity"
+    # Default to @Serializable for backward compatibility
+    return "@Serializable"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_patterns(annotation_name: str) -> Tuple[Pattern, Pattern]:
+    """
+    Get the compiled (annotation_pattern, processed_pattern) pair for an annotation.
+    
+    Matches /* @Entity */ or /*@Entity*/ (ignoring whitespace) and the already
+    processed /*--@Entity--*/ form. Compiled once per annotation name.
+    """
+    escaped = re.escape(annotation_name)
+    return (re.compile(rf'/\*\s*{escaped}\s*\*/'),
+            re.compile(rf'/\*--\s*{escaped}\s*--\*/'))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_class_pattern(class_name: str) -> Pattern:
+    """Get the compiled pattern matching the declaration of class_name (never across lines)."""
+    return re.compile(rf'class[^\S\n]+{re.escape(class_name)}')
+
+
+def parse_lines(lines: List[str]) -> ParsedSource:
+    """
+    Build a ParsedSource from the lines of a file.
+    
+    Args:
+        lines: Lines of the C++ file, with their line endings
         
-        try:
-            import S1_check_dto_macro
-            import S2_extract_dto_fields
-            import S6_discover_validation_macros
-            HAS_SERIALIZATIONLIB = True
-        except ImportError as e:
-            HAS_SERIALIZATIONLIB = False
-    else:
-        HAS_SERIALIZATIONLIB = False
-except Exception as e:
-    HAS_SERIALIZATIONLIB = False
+    Returns:
+        ParsedSource for the lines
+    """
+    lines = list(lines)
+    stripped = [line.strip() for line in lines]
+    is_comment = [line.startswith(_COMMENT_PREFIXES) for line in stripped]
+    brace_delta = [line.count('{') - line.count('}') for line in stripped]
+    brace_lines = [index for index, delta in enumerate(brace_delta) if delta and not is_comment[index]]
+    line_starts = [0]
+    line_starts.extend(itertools.accumulate(map(len, lines)))
+    return ParsedSource(''.join(lines), lines, stripped, line_starts, is_comment, brace_delta, brace_lines)
+
+
+def parse_source(file_path: str) -> ParsedSource:
+    """
+    Read and parse a file, reusing the previous result while its mtime and size are unchanged.
+    
+    Args:
+        file_path: Path to the C++ file
+        
+    Returns:
+        ParsedSource for the file (raises OSError/UnicodeDecodeError if it cannot be read)
+    """
+    key = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    
+    cached = _SOURCE_CACHE.get(key)
+    if cached and cached[0] == version:
+        _SOURCE_CACHE.move_to_end(key)
+        return cached[1]
+    
+    with open(file_path, 'r', encoding='utf-8') as file:
+        parsed = parse_lines(file.readlines())
+    
+    _SOURCE_CACHE[key] = (version, parsed)
+    if len(_SOURCE_CACHE) > _SOURCE_CACHE_SIZE:
+        _SOURCE_CACHE.popitem(last=False)
+    return parsed
+
+
+def invalidate_source(file_path: str) -> None:
+    """Drop the cached ParsedSource of a file (after it has been rewritten)."""
+    _SOURCE_CACHE.pop(os.path.abspath(file_path), None)
+
+
+def find_class_span(parsed: ParsedSource, class_name: str, class_start_hint: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """
+    Find the start and end line numbers of a class definition.
+    
+    Braces are counted per line, skipping lines that start a comment; only the
+    lines whose brace count changes are visited.
+    
+    Args:
+        parsed: ParsedSource of the C++ file
+        class_name: Name of the class
+        class_start_hint: Optional line number of the class declaration (e.g. the
+                          'class_line' found by check_has_serializable_macro); used
+                          when no earlier line could declare the class
+        
+    Returns:
+        Tuple of (start_line, end_line) or None if not found
+    """
+    class_pattern = _get_class_pattern(class_name)
+    class_index = None
+    
+    if class_start_hint and 0 < class_start_hint <= len(parsed.lines):
+        index = class_start_hint - 1
+        if (not parsed.is_comment[index] and class_pattern.search(parsed.lines[index])
+                and class_pattern.search(parsed.raw, 0, parsed.line_starts[index]) is None):
+            class_index = index
+    
+    if class_index is None:
+        # Find the first declaration that is not on a commented line
+        for match in class_pattern.finditer(parsed.raw):
+            index = bisect.bisect_right(parsed.line_starts, match.start()) - 1
+            if not parsed.is_comment[index]:
+                class_index = index
+                break
+        else:
+            return None
+    
+    brace_count = parsed.brace_delta[class_index]
+    if brace_count == 0:
+        return (class_index + 1, class_index + 1)
+    
+    brace_lines = parsed.brace_lines
+    for position in range(bisect.bisect_right(brace_lines, class_index), len(brace_lines)):
+        index = brace_lines[position]
+        brace_count += parsed.brace_delta[index]
+        if brace_count == 0:
+            return (class_index + 1, index + 1)
+    
+    return None
 
 
-def check_has_serializable_macro(file_path: str, serializable_macro: str = "_Entity") -> Optional[Dict[str, any]]:
+@functools.lru_cache(maxsize=64)
+def _get_validation_patterns(macro_names: Tuple[str, ...]) -> Tuple[Dict[str, Pattern], Optional[Pattern]]:
+    """
+    Get compiled validation annotation patterns for a set of macro names.
+    
+    Args:
+        macro_names: Tuple of validation macro names (order is kept so the first
+                     matching macro wins, as before)
+        
+    Returns:
+        Tuple of (patterns by macro name, combined pattern or None if no macros)
+    """
+    # Create annotation patterns (e.g., 'NotNull' -> '/* @NotNull */')
+    annotation_patterns = {}
+    for macro_name in macro_names:
+        annotation_patterns[macro_name] = rf'/\*\s*@{re.escape(macro_name)}\s*\*/'
+    
+    # Combined pattern to match any validation annotation
+    all_annotations = '|'.join(annotation_patterns.values())
+    validation_pattern = re.compile(rf'({all_annotations})') if all_annotations else None
+    
+    return ({name: re.compile(pattern) for name, pattern in annotation_patterns.items()},
+            validation_pattern)
+
+
+def _may_contain(file_path: str, needle: bytes) -> bool:
+    """
+    Cheap literal prefilter: check whether the raw bytes of a file contain needle.
+    
+    Returns True when the file cannot be read, so the caller's normal error handling applies.
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            return needle in file.read()
+    except OSError:
+        return True
+
+
+def _open_lines(file_path: str, content: Optional[str]):
+    """Open the file for reading line by line, or its already read text if given."""
+    if content is not None:
+        return io.StringIO(content)
+    return open(file_path, 'r', encoding='utf-8')
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_validations(project_dir: Optional[str], library_dir: Optional[str]) -> Dict[str, str]:
+    """
+    Discover the project's validation macros, once per (project_dir, library_dir).
+    
+    Requires the serialization scripts. Discovery scans every header of the project and library, and its result only
+    depends on those directories, so it is shared by all extract_id_fields calls.
+    Call _discover_validations.cache_clear() to force a new scan.
+    
+    Returns:
+        Dictionary mapping macro names to validation function names (do not modify)
+    """
+    try:
+        return _load_serialization_lib().S6_discover_validation_macros.find_validation_macro_definitions(None)
+    except:
+        return {}
+
+
+def check_has_serializable_macro(file_path: str, serializable_macro: str = "_Entity",
+                                 content: Optional[str] = None) -> Optional[Dict[str, any]]:
     """
     Check if a file has the @Serializable or @Entity annotation.
     
     Args:
         file_path: Path to the C++ file
         serializable_macro: Name of the macro (Serializable -> @Serializable, _Entity -> @Entity)
+        content: Text of the file if the caller already read it (e.g. ParsedSource.raw);
+                 the file is then not read again
         
     Returns:
         Dictionary with 'class_name', 'has_dto', 'line_number' if found, None otherwise
     """
-    if HAS_SERIALIZATIONLIB:
-        return S1_check_dto_macro.check_dto_macro(file_path, serializable_macro)
+    # Most headers carry no annotation at all: skip decoding and scanning them
+    annotation_name = _get_annotation_name(serializable_macro)
+    if content is not None:
+        if annotation_name not in content:
+            return {'has_dto': False}
+    elif not _may_contain(file_path, annotation_name.encode('ascii')):
+        return {'has_dto': False}
+    
+    lib = _load_serialization_lib()
+    if lib:
+        return lib.S1_check_dto_macro.check_dto_macro(file_path, serializable_macro, content)
     else:
         # Fallback implementation
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-        except Exception as e:
-            # print(f"Error reading file '{file_path}': {e}")
-            return None
-        
-        # Determine annotation name based on macro name
-        if serializable_macro == "_Entity":
-            annotation_name = "@Entity"
-        elif serializable_macro == "Serializable":
-            annotation_name = "@Serializable"
-        else:
-            # Default to @Serializable for backward compatibility
-            annotation_name = "@Serializable"
-        
         # Pattern to match /* @Entity */ or /*@Entity*/ or /* @Serializable */ or /*@Serializable*/ annotation (ignoring whitespace)
         # Also check for already processed /*--@Entity--*/ or /*--@Serializable--*/ pattern
-        annotation_pattern = rf'/\*\s*{re.escape(annotation_name)}\s*\*/'
-        processed_pattern = rf'/\*--\s*{re.escape(annotation_name)}\s*--\*/'
-        class_pattern = r'class\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:[:{])'
+        annotation_pattern, processed_pattern = _get_patterns(annotation_name)
         
-        for line_num, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            # Check if line is already processed (/*--@Entity--*/ or /*--@Serializable--*/)
-            if re.search(processed_pattern, stripped_line):
-                continue
-            
-            # Skip other comments that aren't @Entity/@Serializable annotations
-            # But allow /* @Entity */ or /* @Serializable */ annotations to be processed
-            if stripped_line.startswith('/*') and not re.search(annotation_pattern, stripped_line):
-                continue
-            # Skip single-line comments
-            if stripped_line.startswith('//'):
-                continue
-            
-            # Check for annotation (/* @Entity */ or /*@Entity*/ or /* @Serializable */ or /*@Serializable*/)
-            annotation_match = re.search(annotation_pattern, stripped_line)
-            if annotation_match:
-                for i in range(line_num, min(line_num + 11, len(lines) + 1)):
-                    if i <= len(lines):
-                        next_line = lines[i - 1].strip()
-                        
-                        # Skip other comments that aren't annotations
-                        # But allow /* @Entity */ or /* @Serializable */ annotations to be processed
-                        if next_line.startswith('/*') and not re.search(annotation_pattern, next_line):
-                            continue
-                        # Skip single-line comments
-                        if next_line.startswith('//'):
-                            continue
-                        
-                        class_match = re.search(class_pattern, next_line)
+        # Stream the file instead of reading all lines up front. Each annotation opens
+        # a look-ahead window covering its own line and the next 10 lines; the pending
+        # windows are kept in a small deque, oldest annotation first.
+        pending_annotations = deque()
+        try:
+            with _open_lines(file_path, content) as file:
+                for line_num, line in enumerate(file, 1):
+                    stripped_line = line.strip()
+                    
+                    # Skip single-line comments
+                    if stripped_line.startswith('//'):
+                        continue
+                    
+                    # Skip other comments that aren't @Entity/@Serializable annotations
+                    # But allow /* @Entity */ or /* @Serializable */ annotations to be processed
+                    # (the substring tests keep most lines away from the regex engine)
+                    annotation_match = annotation_pattern.search(stripped_line) if annotation_name in stripped_line else None
+                    if stripped_line.startswith('/*') and not annotation_match:
+                        continue
+                    
+                    # Check for annotation (/* @Entity */ or /*@Entity*/ or /* @Serializable */ or /*@Serializable*/)
+                    # unless the line is already processed (/*--@Entity--*/ or /*--@Serializable--*/)
+                    if annotation_match and not processed_pattern.search(stripped_line):
+                        pending_annotations.append(line_num)
+                    
+                    # Drop annotations whose look-ahead window has been passed
+                    while pending_annotations and pending_annotations[0] + 10 < line_num:
+                        pending_annotations.popleft()
+                    
+                    if pending_annotations:
+                        class_match = 'class' in stripped_line and _CLASS_RE.search(stripped_line)
                         if class_match:
                             class_name = class_match.group(1)
                             return {
                                 'class_name': class_name,
                                 'has_dto': True,
-                                'dto_line': line_num,
-                                'class_line': i
+                                'dto_line': pending_annotations[0],
+                                'class_line': line_num
                             }
+        except Exception as e:
+            # print(f"Error reading file '{file_path}': {e}")
+            return None
         
         return {'has_dto': False}
 
 
-def extract_id_fields(file_path: str, class_name: str, validation_macros: Dict[str, str] = None) -> List[Dict[str, str]]:
+def extract_id_fields(file_path: str, class_name: str, validation_macros: Dict[str, str] = None,
+                      class_start_hint: Optional[int] = None) -> List[Dict[str, str]]:
     """
     Extract all fields marked with @Id annotation.
     
@@ -143,177 +380,171 @@ def extract_id_fields(file_path: str, class_name: str, validation_macros: Dict[s
         file_path: Path to the C++ file
         class_name: Name of the class
         validation_macros: Optional dictionary of validation macros to recognize
+        class_start_hint: Optional line number of the class declaration (the 'class_line'
+                          from check_has_serializable_macro); brace counting starts there
+                          instead of searching the file for the declaration again
         
     Returns:
         List of dictionaries with 'type', 'name', and optional 'validation_macros' keys
         Example: [{'type': 'int', 'name': 'rollNo'}, {'type': 'StdString', 'name': 'name', 'validation_macros': ['NotNull']}]
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
+        parsed = parse_source(file_path)
+        # Find class boundaries
+        lib = _load_serialization_lib()
+        if lib and not class_start_hint:
+            boundaries = lib.S2_extract_dto_fields.find_class_boundaries(file_path, class_name)
+        else:
+            # Fallback implementation (also used when the class line is already known)
+            boundaries = find_class_span(parsed, class_name, class_start_hint)
     except Exception as e:
         # print(f"Error reading file: {e}")
         return []
     
-    # Find class boundaries
-    if HAS_SERIALIZATIONLIB:
-        boundaries = S2_extract_dto_fields.find_class_boundaries(file_path, class_name)
-    else:
-        # Fallback implementation
-        boundaries = None
-        class_start = None
-        brace_count = 0
-        in_class = False
-        class_pattern = rf'class\s+{re.escape(class_name)}'
-        
-        for line_num, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            if stripped_line.startswith('//') or stripped_line.startswith('/*') or stripped_line.startswith('*'):
-                continue
-            
-            if not in_class and re.search(class_pattern, stripped_line):
-                class_start = line_num
-                in_class = True
-                brace_count = stripped_line.count('{') - stripped_line.count('}')
-            elif in_class:
-                brace_count += stripped_line.count('{')
-                brace_count -= stripped_line.count('}')
-            
-            if in_class and brace_count == 0:
-                boundaries = (class_start, line_num)
-                break
-    
     if not boundaries:
         return []
-    
     start_line, end_line = boundaries
-    class_lines = lines[start_line - 1:end_line]
+    return extract_id_fields_from_source(parsed, start_line, end_line, validation_macros)
+
+
+def extract_id_fields_from_lines(class_lines: List[str], validation_macros: Dict[str, str] = None) -> List[Dict[str, str]]:
+    """
+    Extract all fields marked with @Id annotation from already read class lines.
     
-    # Discover validation macros if not provided
+    Args:
+        class_lines: Lines of the class definition (from the class declaration to its closing brace)
+        validation_macros: Optional dictionary of validation macros to recognize
+        
+    Returns:
+        List of dictionaries with 'type', 'name', and optional 'validation_macros' keys
+    """
+    if not class_lines:
+        return []
+    return extract_id_fields_from_source(parse_lines(class_lines), 1, len(class_lines), validation_macros)
+
+
+def extract_id_fields_from_source(parsed: ParsedSource, start_line: int, end_line: int,
+                                  validation_macros: Dict[str, str] = None) -> List[Dict[str, str]]:
+    """
+    Extract all fields marked with @Id annotation from a class of an already parsed file.
+    
+    Args:
+        parsed: ParsedSource of the C++ file
+        start_line: Line number of the class declaration
+        end_line: Line number of the closing brace of the class
+        validation_macros: Optional dictionary of validation macros to recognize
+        
+    Returns:
+        List of dictionaries with 'type', 'name', and optional 'validation_macros' keys
+    """
+    # Locate the /* @Id */ annotations with a single scan over the class text instead
+    # of running the per-line checks on every line. Line starts map each match offset
+    # back to its line index (relative to the class declaration).
+    first_index = start_line - 1
+    line_starts = parsed.line_starts
+    id_line_indexes = sorted({bisect.bisect_right(line_starts, match.start()) - 1 - first_index
+                              for match in _ID_ANNOT_LINE_RE.finditer(parsed.raw, line_starts[first_index], line_starts[end_line])})
+    
+    if not id_line_indexes:
+        # No @Id annotation, so there is no need to discover validation macros
+        return []
+    
+    # Discover validation macros if not provided (once per project, see _discover_validations)
     if validation_macros is None:
-        if HAS_SERIALIZATIONLIB:
-            try:
-                validation_macros = S6_discover_validation_macros.find_validation_macro_definitions(None)
-            except:
-                validation_macros = {}
+        if _load_serialization_lib():
+            validation_macros = _discover_validations(
+                os.environ.get('PROJECT_DIR') or os.environ.get('CMAKE_PROJECT_DIR'),
+                os.environ.get('LIBRARY_DIR'))
         else:
             validation_macros = {}
     
-    # Build pattern for validation annotations
-    macro_names = list(validation_macros.keys()) if validation_macros else []
-    # Create annotation patterns (e.g., 'NotNull' -> '/* @NotNull */')
-    annotation_patterns = {}
-    for macro_name in macro_names:
-        annotation_patterns[macro_name] = rf'/\*\s*@{re.escape(macro_name)}\s*\*/'
-    
-    # Combined pattern to match any validation annotation
-    all_annotations = '|'.join(annotation_patterns.values()) if annotation_patterns else ''
-    validation_pattern = rf'({all_annotations})' if all_annotations else None
+    # Build (cached) patterns for validation annotations
+    macro_names = tuple(validation_macros.keys()) if validation_macros else ()
+    annotation_patterns, validation_pattern = _get_validation_patterns(macro_names)
     
-    # Pattern for /* @Id */ or /*@Id*/ annotation (ignoring whitespace)
-    # Also check for already processed /*--@Id--*/ pattern
-    id_annotation_pattern = r'/\*\s*@Id\s*\*/'
-    id_processed_pattern = r'/\*--\s*@Id\s*--\*/'
+    stripped_lines = parsed.stripped[first_index:end_line]
     
-    # Pattern for field declaration
-    # Matches: "int rollNo;", "StdString name;", "const long digit;", etc.
-    field_pattern = r'^\s*(?:Public|Private|Protected)?\s*(?:const\s+)?([A-Za-z_][A-Za-z0-9_<>*&,\s]*?)\s+([A-Za-z_][A-Za-z0-9_]*)\s*[;=]'
+    # @Id annotations that start a look-ahead (not commented out or already processed /*--@Id--*/)
+    id_starts = [i for i in id_line_indexes
+                 if not stripped_lines[i].startswith('//') and not _ID_PROCESSED_RE.search(stripped_lines[i])]
     
+    # Walk the lines after the annotations with a single forward cursor. Each @Id opens a
+    # window over its next 15 lines (the field may be preceded by validation annotations);
+    # windows can overlap, and every open window reacts the same way to a line, so each
+    # line is classified once for all of them. Lines outside any window are jumped over.
     result = []
-    i = 0
+    windows = deque()  # [start line, validation macros found] of open windows, oldest first
+    next_start = 0
+    line_count = len(stripped_lines)
+    j = 0
     
-    while i < len(class_lines):
-        line = class_lines[i]
-        stripped = line.strip()
-        
-        # Skip other comments that aren't @Id annotations
-        # But allow /* @Id */ annotations to be processed
-        if stripped.startswith('/*') and not re.search(id_annotation_pattern, stripped):
-            i += 1
+    while next_start < len(id_starts) or windows:
+        if not windows:
+            j = max(j, id_starts[next_start] + 1)
+        while next_start < len(id_starts) and id_starts[next_start] < j:
+            windows.append([id_starts[next_start], []])
+            next_start += 1
+        while windows and windows[0][0] + 15 < j:
+            windows.popleft()
+        if j >= line_count:
+            break
+        if not windows:
             continue
-        # Skip single-line comments
-        if stripped.startswith('//'):
-            i += 1
+        
+        next_line = stripped_lines[j]
+        j += 1
+        
+        # Skip empty lines and single-line comments
+        if not next_line or next_line.startswith('//'):
             continue
         
-        # Skip empty lines
-        if not stripped:
-            i += 1
+        # Annotations always contain '@': test for it before running the patterns
+        is_validation = (validation_pattern is not None and '@' in next_line
+                         and validation_pattern.search(next_line) is not None)
+        
+        # Skip other comments that aren't annotations
+        # But allow /* @Id */ and validation annotations to be processed
+        if next_line.startswith('/*') and not (is_validation or ('@Id' in next_line and _ID_ANNOT_RE.search(next_line))):
             continue
         
-        # Check if line is already processed (/*--@Id--*/)
-        if re.search(id_processed_pattern, stripped):
-            i += 1
+        # Check for validation annotations (can appear between @Id and field)
+        if is_validation:
+            # Find which annotation was matched
+            matched_annotation = None
+            for macro_name, pattern in annotation_patterns.items():
+                if pattern.search(next_line):
+                    matched_annotation = macro_name
+                    break
+            if matched_annotation:
+                for window in windows:
+                    window[1].append(matched_annotation)
             continue
         
-        # Check for @Id annotation (/* @Id */ or /*@Id*/)
-        id_match = re.search(id_annotation_pattern, stripped)
-        if id_match:
-            # Look ahead for field declaration (within next 15 lines, may have validation macros in between)
-            found_field = False
-            validation_macros_found = []
+        # Check for field declaration (a declaration always ends in ';' or '=')
+        field_match = _FIELD_RE.search(next_line) if (';' in next_line or '=' in next_line) else None
+        if field_match:
+            field_type = field_match.group(1).strip()
+            field_name = field_match.group(2).strip()
             
-            for j in range(i + 1, min(i + 16, len(class_lines))):
-                next_line = class_lines[j].strip()
-                
-                # Skip other comments that aren't annotations
-                # But allow /* @Id */ and validation annotations to be processed
-                if next_line.startswith('/*') and not (re.search(id_annotation_pattern, next_line) or (validation_pattern and re.search(validation_pattern, next_line))):
-                    continue
-                # Skip single-line comments
-                if next_line.startswith('//'):
-                    continue
-                
-                # Skip empty lines
-                if not next_line:
-                    continue
-                
-                # Check for validation annotations (can appear between @Id and field)
-                if validation_pattern and re.search(validation_pattern, next_line):
-                    # Find which annotation was matched
-                    matched_annotation = None
-                    for macro_name, pattern in annotation_patterns.items():
-                        if re.search(pattern, next_line):
-                            matched_annotation = macro_name
-                            break
-                    if matched_annotation:
-                        validation_macros_found.append(matched_annotation)
-                    continue
-                
-                # Check for field declaration
-                field_match = re.search(field_pattern, next_line)
-                if field_match:
-                    field_type = field_match.group(1).strip()
-                    field_name = field_match.group(2).strip()
+            # Skip if it looks like a method declaration
+            if '(' not in next_line and ')' not in next_line and field_name not in ['public', 'private', 'protected']:
+                for _, validation_macros_found in windows:
+                    field_info = {
+                        'type': field_type,
+                        'name': field_name
+                    }
                     
-                    # Skip if it looks like a method declaration
-                    if '(' not in next_line and ')' not in next_line and field_name not in ['public', 'private', 'protected']:
-                        field_info = {
-                            'type': field_type,
-                            'name': field_name
-                        }
-                        
-                        if validation_macros_found:
-                            field_info['validation_macros'] = validation_macros_found
-                        
-                        result.append(field_info)
-                        found_field = True
-                    break
-                
-                # Stop if we hit another annotation or access specifier
-                if next_line and (re.search(r'^\s*(public|private|protected)\s*:', next_line, re.IGNORECASE) or 
-                                 re.search(r'^\s*(Dto|Serializable|_Entity|COMPONENT|SCOPE|VALIDATE|///\s*@(Id|Entity|Serializable|NotNull|NotEmpty|NotBlank))\s*$', next_line)):
-                    # If we hit another @Id, that's okay, we'll process it in the next iteration
-                    if re.search(id_annotation_pattern, next_line):
-                        break
-                    # Otherwise, stop looking
-                    break
-            
-            i += 1
+                    if validation_macros_found:
+                        field_info['validation_macros'] = validation_macros_found
+                    
+                    result.append(field_info)
+            windows.clear()
             continue
         
-        i += 1
+        # Stop if we hit another annotation or access specifier
+        # (an @Id on this line opens its own window)
+        if _ACCESS_RE.search(next_line) or _STOP_RE.search(next_line):
+            windows.clear()
     
     return result
 
@@ -346,7 +577,7 @@ def extract_id_fields_from_file(file_path: str, serializable_macro: str = "_Enti
         }
     
     # Extract @Id fields
-    id_fields = extract_id_fields(file_path, class_name)
+    id_fields = extract_id_fields(file_path, class_name, class_start_hint=dto_info.get('class_line'))
     
     return {
         'has_serializable': True,
@@ -409,6 +640,13 @@ def main():
 __all__ = [
     'check_has_serializable_macro',
     'extract_id_fields',
+    'extract_id_fields_from_lines',
+    'extract_id_fields_from_source',
+    'ParsedSource',
+    'parse_lines',
+    'parse_source',
+    'invalidate_source',
+    'find_class_span',
     'extract_id_fields_from_file',
     'main'
 ]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+File Cache Script
+
+Remembers, across builds, the headers that gave the pre-build scripts nothing to do.
+
+The repository and serialization scripts run on every build, and most headers are
+unchanged since the previous one. A header is recorded with the modification time
+and size it had when it was found to hold no annotation; while both stay the same,
+the next build skips it without reading it again. A script can also record a digest
+of the content (see content_digest), so that a header rewritten with the same
+content (a checkout, a touch) is recognized from its bytes without being parsed.
+
+Entries are stored as JSON in <project_dir>/build/.springboot_data_cache/<name>.json,
+together with a fingerprint of whatever else decided the outcome (the scripts
+themselves, the annotation name, ...): a different fingerprint discards them all.
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+# xxhash is optional: much faster than the hashlib digests on small files
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# print("Executing springbootplusplus_data_core/file_cache.py")
+
+# Cache directory, relative to the project directory
+CACHE_DIR = os.path.join("build", ".springboot_data_cache")
+
+
+def file_signature(file_path: str) -> Optional[List[int]]:
+    """
+    Identify the current version of a file.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        [mtime_ns, size] of the file, or None if it cannot be stat'ed
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Digest of a file content, to recognize it once its modification time has changed.
+    
+    Args:
+        data: File content as bytes
+        
+    Returns:
+        Hex digest of the content (xxh3_64 if xxhash is installed, 128-bit BLAKE2b otherwise;
+        the two have different lengths, so a digest never matches one of the other kind)
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def scripts_fingerprint(script_paths: Iterable[str], *extra: str) -> str:
+    """
+    Fingerprint of the scripts (and settings) a cached outcome depends on.
+    
+    Args:
+        script_paths: Paths of the script files; editing or updating one changes the fingerprint
+        extra: Other values the outcome depends on (e.g. the annotation name)
+        
+    Returns:
+        String to pass to load_file_cache and save_file_cache
+    """
+    return json.dumps([[path, file_signature(path)] for path in script_paths] + list(extra))
+
+
+def _cache_path(project_dir: str, name: str) -> str:
+    """Path of the JSON file of a named cache."""
+    return os.path.join(project_dir, CACHE_DIR, f"{name}.json")
+
+
+def load_file_cache(project_dir: Optional[str], name: str, fingerprint: str) -> Dict[str, List[int]]:
+    """
+    Load the files recorded by the previous build.
+    
+    Args:
+        project_dir: Path to the client project root (no cache without it)
+        name: Name of the cache
+        fingerprint: Fingerprint the entries must have been saved with
+        
+    Returns:
+        Dictionary of file path -> [mtime_ns, size] (followed by the content digest if
+        one was recorded); empty if there is no usable cache
+    """
+    if not project_dir:
+        return {}
+    try:
+        with open(_cache_path(project_dir, name), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(data, dict) or data.get('fingerprint') != fingerprint or not isinstance(data.get('files'), dict):
+        return {}
+    return data['files']
+
+
+def save_file_cache(project_dir: Optional[str], name: str, fingerprint: str, files: Dict[str, List[int]]) -> bool:
+    """
+    Record the files to skip in the next build (replacing the previous entries).
+    
+    The file is written under a temporary name and then renamed, so a build
+    running at the same time reads either the old or the new entries.
+    
+    Args:
+        project_dir: Path to the client project root (nothing is saved without it)
+        name: Name of the cache
+        fingerprint: Fingerprint of the scripts and settings (see scripts_fingerprint)
+        files: Dictionary of file path -> [mtime_ns, size], optionally followed by a content digest
+        
+    Returns:
+        True if the cache was written, False otherwise
+    """
+    if not project_dir:
+        return False
+    cache_path = _cache_path(project_dir, name)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'files': files}, f)
+        os.replace(temp_path, cache_path)
+        return True
+    except OSError as e:
+        # print(f"Warning: Could not save cache {cache_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+
+# Export functions for other scripts to import
+__all__ = [
+    'CACHE_DIR',
+    'file_signature',
+    'content_digest',
+    'scripts_fingerprint',
+    'load_file_cache',
+    'save_file_cache'
+]
@@ -8,6 +8,60 @@ import os
 from pathlib import Path
 
 
+# Directories to exclude (PlatformIO library and build directories).
+# Excluded directories are pruned during the walk, so their subtrees are never entered.
+EXCLUDE_DIRS = frozenset({
+    '.pio',           # PlatformIO build and library directory
+    '.git',           # Git directory
+    'build',          # Build directory
+    '.vscode',        # VS Code settings (optional, but common)
+    '.idea',          # IDE settings
+})
+
+
+def _scan(root, exclude_dirs, extensions, out):
+    """
+    Collect files under root with an iterative os.scandir walk.
+    
+    The DirEntry objects already carry the entry type from the directory read,
+    so no extra stat calls are needed per file. Symlinked directories are not
+    followed (like os.walk), and symlinked files are reported by their real path.
+    
+    Args:
+        root: Absolute path of the directory to scan
+        exclude_dirs: Set of directory names not to descend into (may be empty)
+        extensions: Set of lowercase extensions (with leading '.') to keep, or None for all files
+        out: List the matching absolute file paths are appended to
+    """
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # Skip directories that cannot be listed
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                
+                if is_dir:
+                    if entry.name not in exclude_dirs and not entry.is_symlink():
+                        stack.append(entry.path)
+                    continue
+                
+                # Filter by extension if extensions are provided
+                if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                    continue
+                
+                if entry.is_symlink():
+                    out.append(os.path.realpath(entry.path))
+                else:
+                    out.append(entry.path)
+
+
 def get_client_files(project_dir, file_extensions=None, skip_exclusions=False):
     """
     Get all files in the client project, excluding library directories.
@@ -22,66 +76,33 @@ def get_client_files(project_dir, file_extensions=None, skip_exclusions=False):
     Returns:
         List of full absolute file paths
     """
-    project_path = Path(project_dir).resolve()
+    # Resolve the project root once; paths below it are built from it directly
+    project_path = str(Path(project_dir).resolve())
     client_files = []
     
     # Normalize file extensions: ensure they start with '.' and are lowercase
     normalized_extensions = None
     if file_extensions:
-        normalized_extensions = []
+        normalized_extensions = set()
         for ext in file_extensions:
             ext_str = str(ext).lower()
             if not ext_str.startswith('.'):
                 ext_str = '.' + ext_str
-            normalized_extensions.append(ext_str)
+            normalized_extensions.add(ext_str)
+    
+    exclude_dirs = EXCLUDE_DIRS
     
-    # Directories to exclude (PlatformIO library and build directories)
-    exclude_dirs = {
-        '.pio',           # PlatformIO build and library directory
-        '.git',           # Git directory
-        'build',          # Build directory
-        '.vscode',        # VS Code settings (optional, but common)
-        '.idea',          # IDE settings
-    }
+    if skip_exclusions:
+        exclude_dirs = frozenset()
+    elif any(part in exclude_dirs for part in Path(project_path).parts):
+        # The project itself is inside an excluded directory, so every file is skipped
+        return client_files
     
     # Walk through the project directory
-    for root, dirs, files in os.walk(project_path):
-        # Convert to Path for easier manipulation
-        root_path = Path(root)
-        
-        # Skip exclusion logic if skip_exclusions is True
-        if not skip_exclusions:
-            # Skip if this directory or any parent is in exclude_dirs
-            should_skip = False
-            for part in root_path.parts:
-                if part in exclude_dirs:
-                    should_skip = True
-                    break
-            
-            if should_skip:
-                # Remove excluded directories from dirs list to prevent walking into them
-                dirs[:] = [d for d in dirs if d not in exclude_dirs]
-                continue
-        
-        # Add files in this directory (with optional extension filtering)
-        for file in files:
-            file_path = root_path / file
-            
-            # Filter by extension if extensions are provided
-            if normalized_extensions:
-                file_ext = file_path.suffix.lower()
-                if file_ext not in normalized_extensions:
-                    continue
-            
-            # Get full absolute path
-            try:
-                full_path = file_path.resolve()
-                client_files.append(str(full_path))
-            except (ValueError, OSError):
-                # Skip if path cannot be resolved
-                continue
+    _scan(project_path, exclude_dirs, normalized_extensions, client_files)
     
-    return sorted(client_files)
+    client_files.sort()
+    return client_files
 
 
 if __name__ == "__main__":
@@ -9,74 +9,154 @@ and injects GetPrimaryKey() and GetPrimaryKeyName() methods at the end of the cl
 import re
 import sys
 import os
+import textwrap
+from collections import OrderedDict, namedtuple
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Tuple
 
 # print("Executing springbootplusplus_data_core/inject_primary_key_methods.py")
 
 # Add parent directory to path for imports
 script_dir = os.path.dirname(os.path.abspath(__file__))
 parent_scripts_dir = os.path.dirname(script_dir)
-sys.path.insert(0, parent_scripts_dir)
-sys.path.insert(0, script_dir)
+for import_dir in (parent_scripts_dir, script_dir):
+    if import_dir not in sys.path:
+        sys.path.insert(0, import_dir)
 
 # Import extract_id_fields
 try:
-    from springbootplusplus_data_core.extract_id_fields import extract_id_fields_from_file, extract_id_fields
+    from springbootplusplus_data_core.extract_id_fields import (
+        extract_id_fields_from_source,
+        check_has_serializable_macro,
+        parse_lines,
+        parse_source,
+        invalidate_source,
+        find_class_span,
+    )
     HAS_EXTRACT_ID = True
 except ImportError as e:
     # print(f"Warning: Could not import extract_id_fields: {e}")
     HAS_EXTRACT_ID = False
 
 
-def find_class_boundaries(file_path: str, class_name: str) -> Optional[tuple]:
+# Result of parsing a file once: its lines (shared with the ParsedSource cache, not to be modified), the annotated class, its boundaries and @Id fields
+_FileParse = namedtuple('_FileParse', 'lines class_name start end id_fields')
+
+# Parsed files keyed by (absolute path, macro), each stored with the (mtime_ns, size) it was parsed at;
+# least recently used first, bounded like the ParsedSource cache of extract_id_fields
+_PARSE_CACHE: Dict[tuple, tuple] = OrderedDict()
+_PARSE_CACHE_SIZE = 128
+
+
+def _find_boundaries_in_lines(lines: Iterable[str], class_name: str, class_start_hint: Optional[int] = None) -> Optional[tuple]:
+    """
+    Find the start and end line numbers of a class definition in a sequence of lines.
+    
+    Args:
+        lines: Lines of the C++ file, with their line endings (a list or an open file)
+        class_name: Name of the class to find
+        class_start_hint: Optional line number of the class declaration; used when
+                          no earlier line could declare the class
+        
+    Returns:
+        Tuple of (start_line, end_line) or None if not found
+    """
+    return find_class_span(parse_lines(lines), class_name, class_start_hint)
+
+
+def find_class_boundaries(file_path: str, class_name: str, class_start_hint: Optional[int] = None) -> Optional[tuple]:
     """
     Find the start and end line numbers of a class definition.
     
     Args:
         file_path: Path to the C++ file
         class_name: Name of the class to find
+        class_start_hint: Optional line number of the class declaration
         
     Returns:
         Tuple of (start_line, end_line) or None if not found
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
+            return _find_boundaries_in_lines(file.readlines(), class_name, class_start_hint)
     except Exception as e:
         # print(f"Error reading file: {e}")
         return None
+
+
+def _parse_file(file_path: str, serializable_macro: str = "_Entity") -> Optional[_FileParse]:
+    """
+    Read and parse a file once: find the annotated class, its boundaries and its @Id fields.
     
-    class_start = None
-    brace_count = 0
-    in_class = False
-    
-    class_pattern = rf'class\s+{re.escape(class_name)}'
+    Results are memoized per (path, macro) and reused while the file's mtime and size
+    are unchanged, so the pipeline does not re-read and re-scan the same file.
     
-    for line_num, line in enumerate(lines, 1):
-        stripped_line = line.strip()
-        
-        # Skip commented lines
-        if stripped_line.startswith('//') or stripped_line.startswith('/*') or stripped_line.startswith('*'):
-            continue
-        
-        # Check for class declaration
-        if not in_class and re.search(class_pattern, stripped_line):
-            class_start = line_num
-            in_class = True
-            # Initialize brace count from this line
-            brace_count = stripped_line.count('{') - stripped_line.count('}')
-        elif in_class:
-            # Count braces for subsequent lines
-            brace_count += stripped_line.count('{')
-            brace_count -= stripped_line.count('}')
+    Args:
+        file_path: Path to the C++ file
+        serializable_macro: Name of the macro (Serializable -> @Serializable, _Entity -> @Entity)
         
-        if in_class:
-            # If braces are balanced and we've closed the class, we're done
-            if brace_count == 0:
-                return (class_start, line_num)
+    Returns:
+        _FileParse, or None if the file could not be read
+    """
+    key = (os.path.abspath(file_path), serializable_macro)
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    version = (stat.st_mtime_ns, stat.st_size)
+    
+    cached = _PARSE_CACHE.get(key)
+    if cached and cached[0] == version:
+        _PARSE_CACHE.move_to_end(key)
+        return cached[1]
+    
+    try:
+        source = parse_source(file_path)
+    except Exception as e:
+        # print(f"Error reading file: {e}")
+        return None
     
-    return None
+    class_name = None
+    start = end = None
+    id_fields = []
+    
+    # The annotation is looked for in the text parse_source already read
+    dto_info = check_has_serializable_macro(file_path, serializable_macro, source.raw)
+    if dto_info and dto_info.get('has_dto') and dto_info.get('class_name'):
+        class_name = dto_info['class_name']
+        boundaries = find_class_span(source, class_name, dto_info.get('class_line'))
+        if boundaries:
+            start, end = boundaries
+            id_fields = extract_id_fields_from_source(source, start, end)
+    
+    parsed = _FileParse(source.lines, class_name, start, end, id_fields)
+    _PARSE_CACHE[key] = (version, parsed)
+    if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+        _PARSE_CACHE.popitem(last=False)
+    return parsed
+
+
+def _invalidate_parse(file_path: str) -> None:
+    """Drop the memoized parse results of a file (after it has been rewritten)."""
+    abs_path = os.path.abspath(file_path)
+    for key in [key for key in _PARSE_CACHE if key[0] == abs_path]:
+        del _PARSE_CACHE[key]
+    invalidate_source(file_path)
+
+
+# GetPrimaryKey(), GetPrimaryKeyName() and GetTableName() methods, indented one level
+_PRIMARY_KEY_METHODS_TEMPLATE = """\
+    inline {field_type} GetPrimaryKey() {{
+        return {field_name};
+    }}
+
+    inline Static StdString GetPrimaryKeyName() {{
+        return "{field_name}";
+    }}
+
+    inline Static StdString GetTableName() {{
+        return "{class_name}";
+    }}"""
 
 
 def generate_primary_key_methods(field_type: str, field_name: str, class_name: str) -> str:
@@ -91,29 +171,11 @@ def generate_primary_key_methods(field_type: str, field_name: str, class_name: s
     Returns:
         String containing the method definitions
     """
-    methods = []
-    
-    # GetPrimaryKey() method
-    methods.append(f"    inline {field_type} GetPrimaryKey() {{")
-    methods.append(f"        return {field_name};")
-    methods.append(f"    }}")
-    methods.append("")
-    
-    # GetPrimaryKeyName() method
-    methods.append(f"    inline Static StdString GetPrimaryKeyName() {{")
-    methods.append(f'        return "{field_name}";')
-    methods.append(f"    }}")
-    methods.append("")
-    
-    # GetTableName() method
-    methods.append(f"    inline Static StdString GetTableName() {{")
-    methods.append(f'        return "{class_name}";')
-    methods.append(f"    }}")
-    
-    return "\n".join(methods)
+    return _PRIMARY_KEY_METHODS_TEMPLATE.format(field_type=field_type, field_name=field_name, class_name=class_name)
 
 
-def inject_primary_key_methods(file_path: str, class_name: str, field_type: str, field_name: str, dry_run: bool = False) -> bool:
+def inject_primary_key_methods(file_path: str, class_name: str, field_type: str, field_name: str, dry_run: bool = False,
+                               parsed: Optional[_FileParse] = None) -> bool:
     """
     Inject GetPrimaryKey() and GetPrimaryKeyName() methods at the end of a class.
     
@@ -123,19 +185,26 @@ def inject_primary_key_methods(file_path: str, class_name: str, field_type: str,
         field_type: Type of the primary key field
         field_name: Name of the primary key field
         dry_run: If True, don't actually modify the file
+        parsed: Optional parse result from _parse_file for this class; if provided,
+                the file is not read and scanned again
         
     Returns:
         True if successful, False otherwise
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-    except Exception as e:
-        # print(f"Error reading file: {e}")
-        return False
+    if parsed is not None and parsed.class_name == class_name:
+        lines = parsed.lines
+        boundaries = (parsed.start, parsed.end) if parsed.start else None
+    else:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                lines = file.readlines()
+        except Exception as e:
+            # print(f"Error reading file: {e}")
+            return False
+        
+        # Find class boundaries
+        boundaries = _find_boundaries_in_lines(lines, class_name)
     
-    # Find class boundaries
-    boundaries = find_class_boundaries(file_path, class_name)
     if not boundaries:
         # print(f"Error: Could not find class boundaries for {class_name}")
         return False
@@ -163,15 +232,8 @@ def inject_primary_key_methods(file_path: str, class_name: str, field_type: str,
     indent_match = re.match(r'^(\s*)', closing_line)
     indent = indent_match.group(1) if indent_match else "    "
     
-    # Add proper indentation to methods
-    indented_methods = []
-    for line in methods_code.split('\n'):
-        if line.strip():  # Non-empty line
-            indented_methods.append(indent + line)
-        else:
-            indented_methods.append('')
-    
-    methods_code = '\n'.join(indented_methods)
+    # Add proper indentation to methods (blank lines stay empty)
+    methods_code = textwrap.indent(methods_code, indent)
     
     if dry_run:
         # print(f"Would inject the following methods into {class_name} in {file_path}:")
@@ -192,21 +254,14 @@ def inject_primary_key_methods(file_path: str, class_name: str, field_type: str,
             insert_position = i + 1
             break
     
-    # Ensure we have a newline before the methods
-    methods_code = '\n' + methods_code
+    # Splice the methods in as one chunk, with a newline before them
+    new_content = ''.join(lines[:insert_position]) + '\n' + methods_code + '\n' + ''.join(lines[insert_position:])
     
-    # Convert methods_code to list of lines with newlines
-    methods_lines = []
-    for line in methods_code.split('\n'):
-        methods_lines.append(line + '\n')
-    
-    # Insert the methods
-    lines[insert_position:insert_position] = methods_lines
-    
-    # Write back to file
+    # Write back to file in a single write
     try:
         with open(file_path, 'w', encoding='utf-8') as file:
-            file.writelines(lines)
+            file.write(new_content)
+        _invalidate_parse(file_path)
         # print(f"✓ Injected GetPrimaryKey() methods into {class_name} in {file_path}")
         return True
     except Exception as e:
@@ -230,10 +285,10 @@ def process_file(file_path: str, serializable_macro: str = "_Entity", dry_run: b
         # print("Error: extract_id_fields module not available")
         return False
     
-    # Extract @Id fields
-    result = extract_id_fields_from_file(file_path, serializable_macro)
+    # Parse the file once (class, boundaries and @Id fields) and reuse it for injection
+    parsed = _parse_file(file_path, serializable_macro)
     
-    if not result or not result.get('has_serializable'):
+    if not parsed or not parsed.class_name:
         # Determine annotation name for display
         if serializable_macro == "_Entity":
             annotation_name = "@Entity"
@@ -244,10 +299,10 @@ def process_file(file_path: str, serializable_macro: str = "_Entity", dry_run: b
         # print(f"File {file_path} does not have {annotation_name} annotation, skipping")
         return False
     
-    id_fields = result.get('id_fields', [])
+    id_fields = parsed.id_fields
     
     if not id_fields:
-        # print(f"No @Id fields found in {result.get('class_name')}, skipping")
+        # print(f"No @Id fields found in {parsed.class_name}, skipping")
         return False
     
     # Use the first @Id field as the primary key
@@ -255,12 +310,56 @@ def process_file(file_path: str, serializable_macro: str = "_Entity", dry_run: b
     primary_key_field = id_fields[0]
     field_type = primary_key_field['type']
     field_name = primary_key_field['name']
-    class_name = result['class_name']
+    class_name = parsed.class_name
     
     # print(f"Found primary key field in {class_name}: {field_type} {field_name}")
     
     # Inject the methods
-    return inject_primary_key_methods(file_path, class_name, field_type, field_name, dry_run)
+    return inject_primary_key_methods(file_path, class_name, field_type, field_name, dry_run, parsed=parsed)
+
+
+def process_files(file_paths: Iterable[str], serializable_macro: str = "_Entity", dry_run: bool = False,
+                  workers: Optional[int] = None) -> List[Tuple[str, bool]]:
+    """
+    Process several files in parallel: each file is independent, so they are spread
+    over a pool of worker processes.
+    
+    Args:
+        file_paths: Paths to the C++ files
+        serializable_macro: Name of the macro (Serializable -> @Serializable, _Entity -> @Entity)
+        dry_run: If True, don't actually modify the files
+        workers: Number of worker processes (defaults to the number of CPUs)
+        
+    Returns:
+        List of (file_path, success) tuples, in the order the files were given
+    """
+    # Each file is processed once, so no two workers ever write the same file
+    unique_paths = []
+    seen = set()
+    for file_path in file_paths:
+        abs_path = os.path.abspath(file_path)
+        if abs_path not in seen:
+            seen.add(abs_path)
+            unique_paths.append(file_path)
+    
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(unique_paths) < 2:
+        return [(file_path, process_file(file_path, serializable_macro, dry_run)) for file_path in unique_paths]
+    
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    context = multiprocessing.get_context('spawn' if sys.platform == 'win32' else 'fork')
+    with ProcessPoolExecutor(max_workers=min(workers, len(unique_paths)), mp_context=context) as executor:
+        futures = [executor.submit(process_file, file_path, serializable_macro, dry_run) for file_path in unique_paths]
+        results = []
+        for file_path, future in zip(unique_paths, futures):
+            try:
+                results.append((file_path, future.result()))
+            except Exception as e:
+                # print(f"Error processing {file_path}: {e}")
+                results.append((file_path, False))
+    return results
 
 
 def main():
@@ -272,8 +371,20 @@ def main():
     )
     parser.add_argument(
         "file_path",
+        nargs="?",
         help="Path to the C++ file"
     )
+    parser.add_argument(
+        "--recursive",
+        metavar="DIR",
+        help="Process every header file under DIR instead of a single file"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for --recursive (defaults to the number of CPUs)"
+    )
     parser.add_argument(
         "--macro",
         default="_Entity",
@@ -287,6 +398,17 @@ def main():
     
     args = parser.parse_args()
     
+    if args.recursive:
+        from springbootplusplus_data_core.get_client_files import get_client_files
+        file_paths = get_client_files(args.recursive, file_extensions=['.h', '.hpp'])
+        results = process_files(file_paths, args.macro, args.dry_run, args.workers)
+        # for file_path, file_success in results:
+        #     print(f"{'✓' if file_success else '-'} {file_path}")
+        return 0
+    
+    if not args.file_path:
+        parser.error("file_path is required unless --recursive is given")
+    
     success = process_file(args.file_path, args.macro, args.dry_run)
     
     return 0 if success else 1
@@ -297,6 +419,7 @@ __all__ = [
     'generate_primary_key_methods',
     'inject_primary_key_methods',
     'process_file',
+    'process_files',
     'main'
 ]
 
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Text helpers shared by the repository scripts.
+
+detect_repository, extract_entity_type and extract_repository_methods all read
+the same repository header and strip its comments before matching against it;
+the file bytes and the stripped text are memoized here so each header is only
+read and scanned once.
+"""
+
+import os
+import re
+import functools
+from typing import Tuple
+
+__all__ = ['read_source_bytes', 'source_version', 'decode_source', 'strip_comments_cached']
+
+# // and /* */ comments in one pass. Same result as stripping // comments first and
+# /* */ comments second: a // inside a block comment still runs to the end of its
+# line (the (?=(...))\1 pair keeps it atomic), so a */ hidden there does not close the block.
+_COMMENTS_RE = re.compile(r'//[^\n]*|/\*(?:(?=(//[^\n]*|[\s\S]))\1)*?\*/(?!/)')
+_LINE_COMMENT_RE = re.compile(r'//[^\n]*')
+
+
+@functools.lru_cache(maxsize=128)
+def strip_comments_cached(content: str) -> str:
+    """
+    Remove both // and /* */ style comments, memoized on the content.
+    
+    Args:
+        content: File content as string
+    
+    Returns:
+        The content with all comments removed
+    """
+    # Nothing to strip: two substring searches are much cheaper than a regex pass
+    if '//' not in content and '/*' not in content:
+        return content
+    
+    # A block comment needs a */ to end on, so past the line holding the last */ only
+    # // comments can match. That part is stripped without the block alternative:
+    # searching for a missing */ rescans the rest of the text for every unclosed /*,
+    # which is quadratic on files with many of them.
+    last_close = content.rfind('*/')
+    if last_close == -1:
+        return _LINE_COMMENT_RE.sub('', content)
+    
+    split = content.find('\n', last_close + 2)
+    if split == -1:
+        return _COMMENTS_RE.sub('', content)
+    
+    return _COMMENTS_RE.sub('', content[:split]) + _LINE_COMMENT_RE.sub('', content[split:])
+
+
+@functools.lru_cache(maxsize=128)
+def _read_bytes(abs_path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a whole file; the (mtime_ns, size) arguments only version the cache entry."""
+    with open(abs_path, 'rb') as f:
+        return f.read()
+
+
+def source_version(file_path: str) -> Tuple[str, int, int]:
+    """
+    Identify the current content of a file for caches keyed on it.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        (absolute path, modification time in ns, size): changes whenever the file is rewritten
+        
+    Raises:
+        OSError: If the file cannot be stat'ed
+    """
+    abs_path = os.path.abspath(file_path)
+    stat = os.stat(abs_path)
+    return (abs_path, stat.st_mtime_ns, stat.st_size)
+
+
+def read_source_bytes(file_path: str) -> bytes:
+    """
+    Read a file as bytes, reusing the last read while the file is unchanged.
+    
+    The file is only read again when its modification time or size changes, so
+    the scripts that look at the same repository header in turn share one read.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        The file content as bytes
+        
+    Raises:
+        OSError: If the file cannot be stat'ed or read
+    """
+    return _read_bytes(*source_version(file_path))
+
+
+def decode_source(raw: bytes) -> str:
+    """
+    Decode raw file bytes the way open(path, 'r', encoding='utf-8').read() would.
+    
+    Lets callers read a file as bytes, run cheap literal checks on those, and only
+    pay for decoding the files that pass them.
+    
+    Args:
+        raw: File content as bytes
+        
+    Returns:
+        The UTF-8 decoded content with universal newlines applied
+        
+    Raises:
+        UnicodeDecodeError: If raw is not valid UTF-8
+    """
+    return raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Script to detect and implement repositories in many files with one Python process.
+
+Running detect_repository.py or implement_repository.py once per file pays the
+interpreter startup for every file. batch_detect and batch_implement take all the
+paths at once and spread them over a pool of worker processes (the work is
+independent per file and CPU bound).
+
+Usage:
+    python batch.py <source_file> [<source_file> ...] [--workers N]
+    python batch.py <source_file> [<source_file> ...] --library-dir <dir> [--dry-run] [--workers N]
+
+Returns:
+    (file_path, (class_name, template_param1, template_param2, is_templated)) per repository found,
+    or (file_path, implemented) per file with --library-dir
+"""
+
+import os
+import sys
+import functools
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# Add current directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from detect_repository import detect_repository
+from implement_repository import implement_repository
+
+
+def _map_files(function: Callable[[str], Any], file_paths: Iterable[str], workers: Optional[int],
+               chunksize: int) -> List[Tuple[str, Any]]:
+    """
+    Apply function to every path, in worker processes when there is more than one file.
+    
+    Args:
+        function: Picklable function taking a file path
+        file_paths: Paths to process
+        workers: Number of worker processes (defaults to the number of CPUs)
+        chunksize: Number of paths handed to a worker at a time
+    
+    Returns:
+        List of (file_path, function(file_path)), in the order the files were given
+    """
+    file_paths = list(file_paths)
+    
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(file_paths) < 2:
+        return [(file_path, function(file_path)) for file_path in file_paths]
+    
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    context = multiprocessing.get_context('spawn' if sys.platform == 'win32' else 'fork')
+    with ProcessPoolExecutor(max_workers=min(workers, len(file_paths)), mp_context=context) as executor:
+        results = executor.map(function, file_paths, chunksize=chunksize)
+        return list(zip(file_paths, results))
+
+
+def batch_detect(file_paths: Iterable[str], workers: Optional[int] = None,
+                 chunksize: int = 64) -> List[Tuple[str, Optional[Tuple[str, str, str, bool]]]]:
+    """
+    Run detect_repository on several files in parallel.
+    
+    Files without the repository literals are rejected by detect_repository
+    before any decoding or regex work, so most paths cost a single read.
+    
+    Args:
+        file_paths: Paths to the C++ files to check
+        workers: Number of worker processes (defaults to the number of CPUs)
+        chunksize: Number of paths handed to a worker at a time
+    
+    Returns:
+        List of (file_path, detect_repository result or None), in the order the files were given
+    """
+    return _map_files(detect_repository, file_paths, workers, chunksize)
+
+
+def batch_implement(file_paths: Iterable[str], library_dir: str, dry_run: bool = False,
+                    workers: Optional[int] = None, chunksize: int = 64) -> List[Tuple[str, bool]]:
+    """
+    Run implement_repository on several files in parallel.
+    
+    Each worker keeps its own read and parse caches. Two repositories with the same
+    class name would race for the same <ClassName>Impl.h, just as the second one
+    is skipped when the files are processed one by one.
+    
+    Args:
+        file_paths: Paths to the C++ files to check
+        library_dir: Path to the library directory (where src/repository folder should be)
+        dry_run: If True, don't actually create the files
+        workers: Number of worker processes (defaults to the number of CPUs)
+        chunksize: Number of paths handed to a worker at a time
+    
+    Returns:
+        List of (file_path, implement_repository result), in the order the files were given
+    """
+    implement = functools.partial(implement_repository, library_dir=library_dir, dry_run=dry_run)
+    return _map_files(implement, file_paths, workers, chunksize)
+
+
+def main():
+    """Main function to handle command line arguments."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Detect (or implement) @Repository classes in several C++ files at once"
+    )
+    parser.add_argument(
+        "file_paths",
+        nargs="+",
+        help="Paths to the C++ files to check"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--library-dir",
+        default=None,
+        help="Implement the repositories found into this library directory (where src/repository folder should be)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --library-dir, show what would be created without creating files"
+    )
+    
+    args = parser.parse_args()
+    
+    if args.library_dir:
+        results = batch_implement(args.file_paths, args.library_dir, args.dry_run, args.workers)
+        return 0 if any(implemented for _, implemented in results) else 1
+    
+    found = False
+    for file_path, result in batch_detect(args.file_paths, args.workers):
+        if result:
+            # print(f"{file_path}: {result[0]}<{result[1]}, {result[2]}> (templated: {result[3]})")
+            found = True
+    
+    return 0 if found else 1
+
+
+# Export functions for other scripts to import
+__all__ = [
+    'batch_detect',
+    'batch_implement',
+    'main'
+]
+
+
+if __name__ == "__main__":
+    exit(main())
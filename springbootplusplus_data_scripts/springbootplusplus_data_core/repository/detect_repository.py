@@ -22,45 +22,53 @@ Detects patterns:
 Returns: class_name, template_param1, template_param2
 """
 
+import os
 import re
 import sys
-from typing import Optional, Tuple
+import functools
+from typing import Iterable, Iterator, Optional, Pattern, Tuple
+
+# Add current directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from _text_utils import read_source_bytes, decode_source, strip_comments_cached
+from repository_parser import scan_repository_declarations, is_templated_class, find_repository_types
+
+# Precompiled patterns (compiled once at import instead of on every call)
+# Matches: /// followed by optional whitespace, then @Repository
+_REPOSITORY_ANNOTATION_RE = re.compile(r'///\s*@Repository\b')
+_DEFINE_STANDARD_POINTERS_RE = re.compile(r'DefineStandardPointers\s*\(\s*(\w+)\s*\)')
+
+
+@functools.lru_cache(maxsize=1024)
+def _templated_class_pattern(class_name: str) -> Pattern:
+    """Compiled pattern matching template<...> class ClassName."""
+    return re.compile(rf'template\s*<\s*[^>]+\s*>\s*class\s+{re.escape(class_name)}')
 
 
 def remove_comments(content: str) -> str:
     """Remove both // and /* */ style comments."""
-    # Remove single-line comments
-    content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-    
-    # Remove multi-line comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    
-    return content
+    return strip_comments_cached(content)
 
 
 def find_repository_annotation(content: str) -> bool:
     """Check if @Repository annotation is present (not processed)."""
-    # Look for /// @Repository or ///@Repository annotation (ignoring whitespace)
-    # Also check for already processed /* @Repository */ pattern
-    # Pattern matches: /// followed by optional whitespace, then @Repository
-    pattern = r'///\s*@Repository\b'
+    # Look for /// @Repository or ///@Repository annotation (ignoring whitespace).
+    # Processed annotations are rewritten to /* @Repository */, which never matches,
+    # so a processed marker elsewhere in the file does not hide an unprocessed one.
     
-    # Check if annotation exists and is not already processed
-    if re.search(pattern, content):
-        # Check if it's already processed (/* @Repository */)
-        processed_pattern = r'/\*\s*@Repository\s*\*/'
-        if re.search(processed_pattern, content):
-            # Already processed, don't treat as found
-            return False
-        return True
+    # Plain substring test first: most files never mention @Repository at all
+    if '@Repository' not in content:
+        return False
     
-    return False
+    return _REPOSITORY_ANNOTATION_RE.search(content) is not None
 
 
 def extract_class_name_from_define_standard_pointers(content: str) -> Optional[str]:
     """Extract class name from DefineStandardPointers(ClassName)."""
-    pattern = r'DefineStandardPointers\s*\(\s*(\w+)\s*\)'
-    match = re.search(pattern, content)
+    match = _DEFINE_STANDARD_POINTERS_RE.search(content)
     if match:
         return match.group(1)
     return None
@@ -71,25 +79,33 @@ def extract_cpaRepository_info(content: str, class_name: str) -> Optional[Tuple[
     # Pattern to match: class ClassName (optional final) : public (optional virtual) CpaRepository<Type1, Type2>
     # Handle both with and without 'final' keyword
     # Handle both with and without 'virtual' keyword
-    pattern = rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<\s*([^,<>]+)\s*,\s*([^,<>]+)\s*>'
-    
-    match = re.search(pattern, content)
-    if match:
-        type1 = match.group(1).strip()
-        type2 = match.group(2).strip()
-        return (type1, type2)
-    return None
+    # Template arguments may nest angle brackets: CpaRepository<Map<K, V>, int>
+    return find_repository_types(scan_repository_declarations(content), class_name)
 
 
-def is_class_templated(content: str, class_name: str) -> bool:
-    """Check if the repository class is templated."""
+def is_class_templated(content: str, class_name: str, content_no_comments: Optional[str] = None) -> bool:
+    """
+    Check if the repository class is templated.
+    
+    content_no_comments may be passed when the caller has already stripped
+    the comments from content, so they are not stripped a second time.
+    """
     # Remove comments for pattern matching
-    content_no_comments = remove_comments(content)
+    if content_no_comments is None:
+        content_no_comments = remove_comments(content)
     
     # Look for template<typename ...> before the class declaration
     # Pattern: template<typename Entity, typename ID> class ClassName
-    pattern = rf'template\s*<\s*[^>]+\s*>\s*class\s+{re.escape(class_name)}'
-    return bool(re.search(pattern, content_no_comments))
+    return bool(_templated_class_pattern(class_name).search(content_no_comments))
+
+
+def _has_repository_literals(raw: bytes) -> bool:
+    """
+    Cheap literal gate on the raw file bytes: a repository header must mention
+    both @Repository and CpaRepository, so anything else can be rejected before
+    it is decoded and scanned with the regexes.
+    """
+    return b'@Repository' in raw and b'CpaRepository' in raw
 
 
 def detect_repository(file_path: str) -> Optional[Tuple[str, str, str, bool]]:
@@ -99,8 +115,11 @@ def detect_repository(file_path: str) -> Optional[Tuple[str, str, str, bool]]:
     Returns: (class_name, template_param1, template_param2, is_templated) or None
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        raw = read_source_bytes(file_path)
+        # Most scanned files are not repositories: skip decoding those at all
+        if not _has_repository_literals(raw):
+            return None
+        content = decode_source(raw)
     except Exception as e:
         # print(f"Error reading file {file_path}: {e}", file=sys.stderr)
         return None
@@ -116,14 +135,17 @@ def detect_repository(file_path: str) -> Optional[Tuple[str, str, str, bool]]:
     if not class_name:
         return None
     
-    # Check if class is templated
-    is_templated = is_class_templated(content, class_name)
-    
     # Remove comments for class pattern matching (to avoid issues with commented code)
     content_no_comments = remove_comments(content)
     
+    # template<...> class and CpaRepository declarations, collected in one pass
+    declarations = scan_repository_declarations(content_no_comments)
+    
+    # Check if class is templated
+    is_templated = is_templated_class(declarations, class_name)
+    
     # Extract CpaRepository template parameters
-    template_params = extract_cpaRepository_info(content_no_comments, class_name)
+    template_params = find_repository_types(declarations, class_name)
     if not template_params:
         return None
     
@@ -131,6 +153,32 @@ def detect_repository(file_path: str) -> Optional[Tuple[str, str, str, bool]]:
     return (class_name, type1, type2, is_templated)
 
 
+def scan_tree(root: str, file_extensions: Iterable[str] = ('.h', '.hpp')) -> Iterator[Tuple[str, Tuple[str, str, str, bool]]]:
+    """
+    Detect the repositories in every header below a directory.
+    
+    Files are listed with get_client_files (so library and build directories are
+    skipped), and detect_repository rejects the ones without the repository
+    literals before doing any decoding or regex work.
+    
+    Args:
+        root: Directory to scan
+        file_extensions: Extensions of the files to check
+        
+    Yields:
+        (file_path, (class_name, template_param1, template_param2, is_templated)) for each repository found
+    """
+    core_dir = os.path.dirname(script_dir)
+    if core_dir not in sys.path:
+        sys.path.insert(0, core_dir)
+    from get_client_files import get_client_files
+    
+    for file_path in get_client_files(root, file_extensions=list(file_extensions)):
+        result = detect_repository(file_path)
+        if result:
+            yield file_path, result
+
+
 def main():
     """Main function to run the script."""
     if len(sys.argv) < 2:
@@ -138,6 +186,13 @@ def main():
         sys.exit(1)
     
     file_path = sys.argv[1]
+    if os.path.isdir(file_path):
+        found = False
+        for repository_file, (class_name, type1, type2, is_templated) in scan_tree(file_path):
+            # print(f"{repository_file}: {class_name}<{type1}, {type2}> (templated: {is_templated})")
+            found = True
+        sys.exit(0 if found else 1)
+    
     result = detect_repository(file_path)
     
     if result:
@@ -20,20 +20,22 @@ Returns:
     The entity type name (e.g., "Customer", "Entity", "User")
 """
 
-import re
+import os
 import sys
 from typing import Optional
 
+# Add current directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from _text_utils import read_source_bytes, decode_source, strip_comments_cached
+from repository_parser import scan_repository_declarations, is_templated_class, find_repository_types
+
 
 def remove_comments(content: str) -> str:
     """Remove both // and /* */ style comments."""
-    # Remove single-line comments
-    content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-    
-    # Remove multi-line comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    
-    return content
+    return strip_comments_cached(content)
 
 
 def extract_entity_type(repository_file: str) -> Optional[str]:
@@ -47,8 +49,11 @@ def extract_entity_type(repository_file: str) -> Optional[str]:
         Entity type name (e.g., "Customer", "Entity", "User"), or None if not found
     """
     try:
-        with open(repository_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        raw = read_source_bytes(repository_file)
+        # Not a repository: no need to decode or strip anything
+        if b'DefineStandardPointers' not in raw or b'CpaRepository' not in raw:
+            return None
+        content = decode_source(raw)
     except Exception as e:
         print(f"Error reading file {repository_file}: {e}", file=sys.stderr)
         return None
@@ -56,25 +61,24 @@ def extract_entity_type(repository_file: str) -> Optional[str]:
     # Remove comments for pattern matching
     content_no_comments = remove_comments(content)
     
+    # DefineStandardPointers, template<...> class and CpaRepository declarations in one pass
+    declarations = scan_repository_declarations(content_no_comments)
+    
     # Extract class name from DefineStandardPointers
-    class_name_match = re.search(r'DefineStandardPointers\s*\(\s*(\w+)\s*\)', content_no_comments)
-    if not class_name_match:
+    class_name = declarations.define_name
+    if not class_name:
         return None
     
-    class_name = class_name_match.group(1)
-    
     # Check if class is templated
-    is_templated = bool(re.search(rf'template\s*<\s*[^>]+\s*>\s*class\s+{re.escape(class_name)}', content_no_comments))
+    is_templated = is_templated_class(declarations, class_name)
     
     # Extract CpaRepository template parameters
     # Pattern: class ClassName : public CpaRepository<EntityType, IDType>
-    pattern = rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<\s*([^,<>]+)\s*,\s*([^,<>]+)\s*>'
-    
-    match = re.search(pattern, content_no_comments)
-    if not match:
+    template_params = find_repository_types(declarations, class_name)
+    if not template_params:
         return None
     
-    entity_type = match.group(1).strip()
+    entity_type = template_params[0]
     
     # For templated repositories, return "Entity" (the template parameter)
     # For non-templated repositories, return the concrete type
@@ -28,6 +28,12 @@ import re
 import sys
 from typing import Optional
 
+# Precompiled patterns (compiled once at import instead of on every call)
+# Method declaration, capturing the method name (see extract_method_name_from_declaration)
+_METHOD_DECL_RE = re.compile(r'(?:Public|Private|Protected|Virtual)?\s*(?:Virtual\s+|Static\s+)?[A-Za-z_][A-Za-z0-9_<>:&*,\s]+\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(')
+# FindBy methods (case-insensitive): FindBy, FindByLastName, FindByName, etc.
+_FINDBY_RE = re.compile(r'^FindBy(.+)$', re.IGNORECASE)
+
 
 def pascal_to_camel(pascal_case: str) -> str:
     """
@@ -42,9 +48,11 @@ def pascal_to_camel(pascal_case: str) -> str:
     if not pascal_case:
         return ""
     
-    # If first character is uppercase, make it lowercase
-    if pascal_case[0].isupper():
-        return pascal_case[0].lower() + pascal_case[1:]
+    # If first character is uppercase, make it lowercase. The isupper() test stays:
+    # lower() would also change titlecase letters such as 'ǅ', which are left as is.
+    first = pascal_case[0]
+    if first.isupper():
+        return first.lower() + pascal_case[1:]
     
     return pascal_case
 
@@ -78,8 +86,7 @@ def extract_method_name_from_declaration(method_declaration: str) -> Optional[st
     # ([A-Za-z_][A-Za-z0-9_]*)                 - Method name (captured)
     # \s*\(                                     - Opening parenthesis
     
-    pattern = r'(?:Public|Private|Protected|Virtual)?\s*(?:Virtual\s+|Static\s+)?[A-Za-z_][A-Za-z0-9_<>:&*,\s]+\s+([A-Za-z_][A-Za-z0-9_]*)\s*\('
-    match = re.search(pattern, method_declaration)
+    match = _METHOD_DECL_RE.search(method_declaration)
     
     if match:
         return match.group(1)
@@ -110,8 +117,7 @@ def extract_findby_variable_name(method_input: str) -> Optional[str]:
     
     # Pattern to match FindBy methods (case-insensitive)
     # Matches: FindBy, FindByLastName, FindByName, etc.
-    pattern = r'^FindBy(.+)$'
-    match = re.match(pattern, method_name, re.IGNORECASE)
+    match = _FINDBY_RE.match(method_name)
     
     if not match:
         return None
@@ -30,7 +30,8 @@ Returns:
 
 import re
 import sys
-from typing import Optional, List
+import functools
+from typing import Iterable, Optional, List
 
 
 # Standard JpaRepository actions
@@ -43,11 +44,24 @@ STANDARD_ACTIONS = [
     'Count',
 ]
 
+# Action followed by "By" (compiled once at import)
+_ACTION_BY_RE = re.compile(r'^([A-Z][a-z]+)By')
 
+_VALID_ACTIONS = frozenset(STANDARD_ACTIONS)
+
+# Standalone method names mapped to their action: the action itself (e.g. "Save"),
+# followed by "All" (e.g. "FindAll") or followed by "ById" (e.g. "FindById")
+_EXACT_ACTIONS = {f"{action}{suffix}": action for action in STANDARD_ACTIONS for suffix in ('', 'All', 'ById')}
+
+
+@functools.lru_cache(maxsize=1024)
 def extract_method_action(method_name: str) -> Optional[str]:
     """
     Extract action from a repository method name.
     
+    Results are memoized: repositories repeat the same method names
+    (FindById, Save, ...), so each name is only classified once.
+    
     Args:
         method_name: Method name like "FindByFirstName", "DeleteByLastName", etc.
         
@@ -57,35 +71,38 @@ def extract_method_action(method_name: str) -> Optional[str]:
     if not method_name:
         return None
     
+    # Standalone action methods (e.g., Save, Update, FindAll, DeleteAll, FindById):
+    # a single dict lookup. For these the "By" pattern below would give the same action.
+    action = _EXACT_ACTIONS.get(method_name)
+    if action is not None:
+        return action
+    
     # Pattern to match actions followed by "By"
     # Matches: FindBy, DeleteBy, ExistsBy, CountBy
-    pattern = r'^([A-Z][a-z]+)By'
-    match = re.match(pattern, method_name)
+    match = _ACTION_BY_RE.match(method_name)
     
     if match:
         action = match.group(1)
         # Validate that it's a standard action
-        if action in STANDARD_ACTIONS:
-            return action
-    
-    # Check for methods without "By" (e.g., Save, Update, FindAll, DeleteAll, CountAll)
-    # These are standalone action methods
-    for action in STANDARD_ACTIONS:
-        # Exact match (e.g., "Save", "Update")
-        if method_name == action:
-            return action
-        
-        # Action followed by "All" (e.g., "FindAll", "DeleteAll", "CountAll")
-        if method_name == f"{action}All":
-            return action
-        
-        # Action followed by "ById" (e.g., "FindById", "DeleteById", "ExistsById")
-        if method_name == f"{action}ById":
+        if action in _VALID_ACTIONS:
             return action
     
     return None
 
 
+def extract_method_actions(method_names: Iterable[str]) -> List[Optional[str]]:
+    """
+    Extract the actions of several method names at once.
+    
+    Args:
+        method_names: Method names like "FindByFirstName", "Save", etc.
+        
+    Returns:
+        List with the action (or None) of each method name, in the same order
+    """
+    return [extract_method_action(method_name) for method_name in method_names]
+
+
 def main():
     """Main function to handle command line arguments."""
     if len(sys.argv) < 2:
@@ -106,6 +123,7 @@ def main():
 # Export function for other scripts to import
 __all__ = [
     'extract_method_action',
+    'extract_method_actions',
     'STANDARD_ACTIONS',
     'main'
 ]
@@ -22,10 +22,14 @@ Returns:
     The extracted parameter name, or None if not found
 """
 
-import re
 import sys
+import string
 from typing import Optional
 
+# Characters of an (ASCII) identifier, and the ones it cannot start with
+_IDENTIFIER_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+_DIGITS = frozenset(string.digits)
+
 
 def extract_parameter_name(method_declaration: str) -> Optional[str]:
     """
@@ -42,14 +46,15 @@ def extract_parameter_name(method_declaration: str) -> Optional[str]:
         return None
     
     # Find the parameter list (content between parentheses)
-    # Pattern to match: MethodName(...)
-    param_pattern = r'\(([^)]*)\)'
-    match = re.search(param_pattern, method_declaration)
-    
-    if not match:
+    # MethodName(...): from the first '(' up to the first ')' after it
+    open_paren = method_declaration.find('(')
+    if open_paren == -1:
+        return None
+    close_paren = method_declaration.find(')', open_paren + 1)
+    if close_paren == -1:
         return None
     
-    parameters = match.group(1).strip()
+    parameters = method_declaration[open_paren + 1:close_paren].strip()
     
     # If no parameters, return None
     if not parameters:
@@ -75,23 +80,27 @@ def extract_parameter_name(method_declaration: str) -> Optional[str]:
     # - ID id -> id
     # - string abcf_ffd -> abcf_ffd
     
-    # Pattern breakdown:
+    # What counts as the name:
     # Match the last identifier (parameter name) which can contain letters, numbers, underscores
     # It should be at the end of the parameter declaration
     # Handle cases with const, &, *, etc. before the name
     
-    # More robust pattern:
+    # In other words:
     # - Skip any leading keywords (const, volatile, etc.)
     # - Skip type (which can include ::, <>, &, *, etc.)
     # - Capture the parameter name (identifier at the end)
     
-    # Pattern: match identifier at the end (after type and modifiers)
-    # The parameter name is the last word-like identifier
-    param_name_pattern = r'([A-Za-z_][A-Za-z0-9_]*)\s*$'
-    param_match = re.search(param_name_pattern, first_param)
-    
-    if param_match:
-        return param_match.group(1)
+    # Take the identifier at the end (after type and modifiers):
+    # the trailing run of identifier characters, without its leading digits
+    end = len(first_param)
+    start = end
+    while start > 0 and first_param[start - 1] in _IDENTIFIER_CHARS:
+        start -= 1
+    while start < end and first_param[start] in _DIGITS:
+        start += 1
+    
+    if start < end:
+        return first_param[start:]
     
     return None
 
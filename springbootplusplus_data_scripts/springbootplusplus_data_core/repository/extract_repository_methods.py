@@ -12,20 +12,55 @@ Returns:
     List of method names found in the repository
 """
 
+import os
 import re
 import sys
-from typing import List, Optional
+import string
+import functools
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+# Add current directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from _text_utils import read_source_bytes, decode_source, strip_comments_cached
+from repository_parser import split_template_args
+
+# Precompiled patterns (compiled once at import instead of on every call)
+_DEFINE_STANDARD_POINTERS_RE = re.compile(r'DefineStandardPointers\s*\(\s*(\w+)\s*\)')
+# Class body following the base class list: { ... };
+_CLASS_BODY_RE = re.compile(r'\s*{(.*?)};', re.DOTALL)
+
+# Pieces of the two declaration patterns quoted in _iter_method_declarations.
+# Everything before the '(' of a declaration is made of these characters:
+_NON_DECL_PREFIX_CHAR_RE = re.compile(r'[^A-Za-z0-9_<>:&*,\s]')
+_ACCESS_MODIFIER_RE = re.compile(r'(?:Public|Private|Protected)\s')
+_WORD_START_RE = re.compile(r'\b[A-Za-z_]')
+# What follows the ')' of the parameter list
+_DECL_TAIL_RE = re.compile(r'(?:\s+const)?(?:\s+override)?(?:\s*=\s*0)?\s*;')
+_NAME_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+_NAME_START_CHARS = frozenset(string.ascii_letters + '_')
+
+
+@functools.lru_cache(maxsize=1024)
+def _class_body_patterns(class_name: str) -> Tuple[Pattern, Pattern, Pattern]:
+    """
+    Compiled (repository_pattern, plain_pattern, repository_header_pattern) for class_name.
+    
+    The first captures the body of class ClassName : public CpaRepository<...> { ... };
+    the second the body of the same class without inheritance. The third matches
+    class ClassName : public CpaRepository< up to the '<', for template arguments
+    with nested angle brackets, which the first cannot match.
+    """
+    return (re.compile(rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<\s*[^>]+\s*>\s*{{(.*?)}};', re.DOTALL),
+            re.compile(rf'class\s+{re.escape(class_name)}\s*(?:final\s+)?{{(.*?)}};', re.DOTALL),
+            re.compile(rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<'))
 
 
 def remove_comments(content: str) -> str:
     """Remove both // and /* */ style comments."""
-    # Remove single-line comments
-    content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-    
-    # Remove multi-line comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    
-    return content
+    return strip_comments_cached(content)
 
 
 def extract_class_content(content: str, class_name: str) -> Optional[str]:
@@ -44,21 +79,111 @@ def extract_class_content(content: str, class_name: str) -> Optional[str]:
     
     # Pattern to match class declaration and extract its body
     # Handles: class ClassName : public CpaRepository<...> { ... };
-    pattern = rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<\s*[^>]+\s*>\s*{{(.*?)}};'
-    
-    match = re.search(pattern, content_no_comments, re.DOTALL)
+    repository_pattern, plain_pattern, repository_header_pattern = _class_body_patterns(class_name)
+    match = repository_pattern.search(content_no_comments)
     if match:
         return match.group(1)
     
+    # Template arguments with nested angle brackets: CpaRepository<Map<K, V>, int>
+    for header in repository_header_pattern.finditer(content_no_comments):
+        split = split_template_args(content_no_comments, header.end())
+        if split:
+            body_match = _CLASS_BODY_RE.match(content_no_comments, split[1])
+            if body_match:
+                return body_match.group(1)
+    
     # Also try without inheritance (in case it's a different pattern)
-    pattern2 = rf'class\s+{re.escape(class_name)}\s*(?:final\s+)?{{(.*?)}};'
-    match2 = re.search(pattern2, content_no_comments, re.DOTALL)
+    match2 = plain_pattern.search(content_no_comments)
     if match2:
         return match2.group(1)
     
     return None
 
 
+def _iter_method_declarations(class_content: str, with_access: bool) -> Iterator[Tuple[int, int, int, int]]:
+    r"""
+    Find the method declarations these patterns match, without running them.
+    
+    With an access modifier (with_access=True; see extract_method_names for the breakdown):
+        (?:Public|Private|Protected)\s+(?:Virtual\s+|Static\s+)?(?:const\s+)?
+        ([A-Za-z_][A-Za-z0-9_<>:&*,\s]*)\s+([A-Za-z_][A-Za-z0-9_]*)
+        \s*\([^)]*\)(?:\s+const)?(?:\s+override)?(?:\s*=\s*0)?\s*;
+    Without an explicit access modifier (with_access=False):
+        \b([A-Za-z_][A-Za-z0-9_<>:&*,\s]+)\s+([A-Za-z_][A-Za-z0-9_]*)
+        \s*\([^)]*\)(?:\s+const)?(?:\s+override)?(?:\s*=\s*0)?\s*;
+    (each pattern is split over three lines here, to be joined without spaces)
+    
+    Both patterns have an ambiguous return type / method name split that makes the
+    regex engine backtrack over every run of type characters, even the many that
+    are not followed by a parameter list. Here each '(' is a candidate: the tail
+    after its ')' and the method name before it are checked with plain string
+    operations first, and only then is the leftmost valid start looked for in
+    the run of declaration characters before the name. Matches are the same
+    (and in the same order) as finditer of the corresponding pattern.
+    
+    Args:
+        class_content: The body of a class definition
+        with_access: True to require a Public/Private/Protected access modifier
+        
+    Yields:
+        (start, name_start, name_end, end) of each declaration, so that
+        class_content[start:end] is the whole match, class_content[start:name_start - 1]
+        the return type group and class_content[name_start:name_end] the method name
+    """
+    pos = 0
+    # No match can start before lo (either pos or just after a rejected '(')
+    lo = 0
+    paren = class_content.find('(')
+    while paren != -1:
+        close = class_content.find(')', paren + 1)
+        if close == -1:
+            return
+        
+        declaration = None
+        tail = _DECL_TAIL_RE.match(class_content, close + 1)
+        if tail:
+            # Method name: the identifier just before '(', preceded by whitespace
+            name_end = paren
+            while name_end > lo and class_content[name_end - 1].isspace():
+                name_end -= 1
+            name_start = name_end
+            while name_start > lo and class_content[name_start - 1] in _NAME_CHARS:
+                name_start -= 1
+            
+            if (lo < name_start < name_end and
+                    class_content[name_start] in _NAME_START_CHARS and
+                    class_content[name_start - 1].isspace()):
+                # The match starts in the run of declaration characters before the name
+                start = lo
+                bad = _NON_DECL_PREFIX_CHAR_RE.search(class_content, start, name_start)
+                while bad:
+                    start = bad.end()
+                    bad = _NON_DECL_PREFIX_CHAR_RE.search(class_content, start, name_start)
+                
+                if with_access:
+                    # Access modifier, whitespace, then a return type before the name's whitespace
+                    for access in _ACCESS_MODIFIER_RE.finditer(class_content, start, name_start):
+                        first = access.end()
+                        while class_content[first].isspace():
+                            first += 1
+                        if first <= name_start - 2 and class_content[first] in _NAME_START_CHARS:
+                            declaration = (access.start(), name_start, name_end, tail.end())
+                            break
+                else:
+                    # A word of at least two characters, then whitespace before the name
+                    word = _WORD_START_RE.search(class_content, start, name_start)
+                    if word and word.start() <= name_start - 3:
+                        declaration = (word.start(), name_start, name_end, tail.end())
+        
+        if declaration:
+            yield declaration
+            pos = lo = declaration[3]
+            paren = class_content.find('(', pos)
+        else:
+            lo = paren + 1
+            paren = class_content.find('(', lo)
+
+
 def extract_method_names(class_content: str) -> List[str]:
     """
     Extract method names from class content.
@@ -92,11 +217,8 @@ def extract_method_names(class_content: str) -> List[str]:
     # \s*;                                      - Semicolon
     
     # Primary pattern for methods with access modifiers
-    pattern = r'(?:Public|Private|Protected)\s+(?:Virtual\s+|Static\s+)?(?:const\s+)?([A-Za-z_][A-Za-z0-9_<>:&*,\s]*)\s+([A-Za-z_][A-Za-z0-9_]*)\s*\([^)]*\)(?:\s+const)?(?:\s+override)?(?:\s*=\s*0)?\s*;'
-    
-    matches = re.finditer(pattern, class_content)
-    for match in matches:
-        method_name = match.group(2).strip()
+    for start, name_start, name_end, end in _iter_method_declarations(class_content, True):
+        method_name = class_content[name_start:name_end]
         # Filter out keywords, destructors, and invalid names
         if (method_name and 
             method_name not in ['Public', 'Private', 'Protected', 'Virtual', 'Static', 'const', 'override'] and
@@ -108,11 +230,10 @@ def extract_method_names(class_content: str) -> List[str]:
     # This handles cases where methods might be declared differently
     # Match: ReturnType MethodName(...);
     # But be careful not to match variable declarations
-    simple_pattern = r'\b([A-Za-z_][A-Za-z0-9_<>:&*,\s]+)\s+([A-Za-z_][A-Za-z0-9_]*)\s*\([^)]*\)(?:\s+const)?(?:\s+override)?(?:\s*=\s*0)?\s*;'
-    simple_matches = re.finditer(simple_pattern, class_content)
-    for match in simple_matches:
-        return_type = match.group(1).strip()
-        method_name = match.group(2).strip()
+    for start, name_start, name_end, end in _iter_method_declarations(class_content, False):
+        return_type = class_content[start:name_start - 1].strip()
+        method_name = class_content[name_start:name_end]
+        declaration = class_content[start:end]
         
         # Filter out common keywords and invalid method names
         invalid_names = ['Public', 'Private', 'Protected', 'Virtual', 'Static', 'const', 'override', 'if', 'for', 'while', 'return']
@@ -124,7 +245,7 @@ def extract_method_names(class_content: str) -> List[str]:
             len(return_type.split()) > 0):  # Return type should have some content
             # Additional check: make sure it's not a variable declaration
             # Variables typically don't have 'override' or '= 0'
-            if 'override' in match.group(0) or '= 0' in match.group(0):
+            if 'override' in declaration or '= 0' in declaration:
                 method_names.append(method_name)
             # Also include if it starts with uppercase (likely a method)
             elif method_name[0].isupper():
@@ -144,14 +265,18 @@ def extract_repository_methods(file_path: str) -> List[str]:
         List of method names found in the repository
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        raw = read_source_bytes(file_path)
+        # Not a repository: no need to decode anything
+        if b'DefineStandardPointers' not in raw:
+            print(f"Could not find DefineStandardPointers in {file_path}", file=sys.stderr)
+            return []
+        content = decode_source(raw)
     except Exception as e:
         print(f"Error reading file {file_path}: {e}", file=sys.stderr)
         return []
     
     # Extract class name from DefineStandardPointers
-    class_name_match = re.search(r'DefineStandardPointers\s*\(\s*(\w+)\s*\)', content)
+    class_name_match = _DEFINE_STANDARD_POINTERS_RE.search(content)
     if not class_name_match:
         print(f"Could not find DefineStandardPointers in {file_path}", file=sys.stderr)
         return []
@@ -34,8 +34,81 @@ Returns:
 
 import re
 import sys
+import string
 from typing import Optional, Tuple
 
+# Leading access modifiers recognized by parse_function_signature
+_ACCESS_MODIFIERS = frozenset(('Public', 'Private', 'Protected', 'Virtual'))
+
+# Characters of an (ASCII) identifier, and the ones it cannot start with
+_IDENTIFIER_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+_DIGITS = frozenset(string.digits)
+# A return type as parse_function_signature accepts it (at least two characters)
+_RETURN_TYPE_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_<>:&*,\s]+')
+
+
+def _strip_suffix_tokens(text: str, tokens: Tuple[str, ...]) -> str:
+    """
+    Strip trailing whitespace, then each of tokens (innermost last) if present,
+    each followed by the whitespace before it.
+    
+    Args:
+        text: Text to strip
+        tokens: Optional tokens, in the order they are removed from the end
+        
+    Returns:
+        The stripped text
+    """
+    text = text.rstrip()
+    for token in tokens:
+        if text.endswith(token):
+            text = text[:-len(token)].rstrip()
+    return text
+
+
+def _strip_eq_zero(signature: str) -> str:
+    """
+    Remove a trailing "= 0;" (the ';' being optional) and the whitespace around it.
+    
+    Returns:
+        The signature without "= 0;", or unchanged if it does not end with one
+    """
+    stripped = _strip_suffix_tokens(signature, (';',))
+    if not stripped.endswith('0'):
+        return signature
+    stripped = stripped[:-1].rstrip()
+    if not stripped.endswith('='):
+        return signature
+    return stripped[:-1].rstrip()
+
+
+def _replace_last_identifier(declaration: str, new_name: str) -> str:
+    """
+    Replace the identifier at the end of a parameter declaration.
+    
+    Same result as re.sub(r'([A-Za-z_][A-Za-z0-9_]*)\\s*$', new_name, declaration),
+    found with a backwards scan instead of the regex engine.
+    
+    Args:
+        declaration: Parameter declaration like "CStdString& lastName"
+        new_name: Name to put in place of the last identifier
+        
+    Returns:
+        The declaration with its last identifier (and trailing whitespace) replaced,
+        or unchanged if it does not end with an identifier
+    """
+    declaration_end = len(declaration.rstrip())
+    # The trailing run of identifier characters, without its leading digits
+    start = declaration_end
+    while start > 0 and declaration[start - 1] in _IDENTIFIER_CHARS:
+        start -= 1
+    while start < declaration_end and declaration[start] in _DIGITS:
+        start += 1
+    
+    if start == declaration_end:
+        return declaration
+    return declaration[:start] + new_name
+
 
 def parse_function_signature(signature: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
     """
@@ -51,17 +124,16 @@ def parse_function_signature(signature: str) -> Tuple[Optional[str], Optional[st
         return (None, None, None, None)
     
     # Remove trailing "override {" or "= 0;" or just "{"
-    signature = re.sub(r'\s*(override\s*)?\{?\s*$', '', signature)
-    signature = re.sub(r'\s*=\s*0\s*;?\s*$', '', signature)
+    signature = _strip_suffix_tokens(signature, ('{', 'override'))
+    signature = _strip_eq_zero(signature)
     signature = signature.strip()
     
     # Extract access modifier (Public, Private, Protected, or Virtual)
-    access_match = re.match(r'^(Public|Private|Protected|Virtual)\s+', signature)
-    access_modifier = access_match.group(1) if access_match else None
-    
-    # Remove access modifier from signature for further parsing
-    if access_modifier:
-        signature = re.sub(r'^(Public|Private|Protected|Virtual)\s+', '', signature)
+    # and remove it from signature for further parsing
+    access_modifier = None
+    words = signature.split(None, 1)
+    if len(words) == 2 and words[0] in _ACCESS_MODIFIERS:
+        access_modifier, signature = words
     
     # Check for Virtual keyword
     has_virtual = False
@@ -79,15 +151,24 @@ def parse_function_signature(signature: str) -> Tuple[Optional[str], Optional[st
     
     # Extract return type and method name
     # Pattern: ReturnType MethodName(parameters)
-    method_pattern = r'^([A-Za-z_][A-Za-z0-9_<>:&*,\s]+)\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(([^)]*)\)'
-    match = re.match(method_pattern, signature)
+    # The parameters run from the first '(' to the first ')' after it
+    open_paren = signature.find('(')
+    close_paren = signature.find(')', open_paren + 1) if open_paren != -1 else -1
+    if close_paren == -1:
+        return (access_modifier, None, None, None)
     
-    if not match:
+    # The method name is the last word before the '(' and is separated from the
+    # return type by whitespace; the return type starts with a letter or '_' and
+    # only holds identifier characters, <>:&*, and whitespace
+    head = signature[:open_paren].rstrip()
+    words = head.rsplit(None, 1)
+    method_name = words[1] if len(words) == 2 else ''
+    return_type = head[:len(head) - len(method_name) - 1]
+    if not (method_name.isascii() and method_name.isidentifier()) or not _RETURN_TYPE_RE.fullmatch(return_type):
         return (access_modifier, None, None, None)
     
-    return_type = match.group(1).strip()
-    method_name = match.group(2).strip()
-    parameter_declaration = match.group(3).strip()
+    return_type = return_type.strip()
+    parameter_declaration = signature[open_paren + 1:close_paren].strip()
     
     return (access_modifier, return_type, method_name, parameter_declaration)
 
@@ -116,46 +197,46 @@ def generate_find_implementation(access_modifier: str, return_type: str, method_
     # Build the method signature
     method_signature = f"    {access_modifier} {return_type} {method_name}({parameter_declaration}) override {{"
     
+    # Collect the lines of the implementation and join them once at the end.
+    # All three forms scan FindAll() for entities whose field matches the parameter.
+    lines = [method_signature, f"        StdVector<{entity_type}> entities = FindAll();"]
+    
     # Generate implementation based on return type
     if is_optional:
         # Return optional<EntityType> - find first match
-        code = f"""{method_signature}
-        StdVector<{entity_type}> entities = FindAll();
-        for (const auto& entity : entities) {{
-            if (entity.{variable_name} == {parameter_name}) {{
-                return entity;
-            }}
-        }}
-        return std::nullopt;
-    }}"""
+        on_match = "                return entity;"
+        tail = ("        return std::nullopt;",)
     elif is_vector:
         # Return StdVector<EntityType> - find all matches
-        code = f"""{method_signature}
-        StdVector<{entity_type}> entities = FindAll();
-        StdVector<{entity_type}> result;
-        for (const auto& entity : entities) {{
-            if (entity.{variable_name} == {parameter_name}) {{
-                result.push_back(entity);
-            }}
-        }}
-        return result;
-    }}"""
+        lines.append(f"        StdVector<{entity_type}> result;")
+        on_match = "                result.push_back(entity);"
+        tail = ("        return result;",)
     else:
         # Return single EntityType - find first match (may need to handle not found case)
-        code = f"""{method_signature}
-        StdVector<{entity_type}> entities = FindAll();
-        for (const auto& entity : entities) {{
-            if (entity.{variable_name} == {parameter_name}) {{
-                return entity;
-            }}
-        }}
-        // TODO: Handle case when entity not found
-        return {entity_type}();
-    }}"""
+        on_match = "                return entity;"
+        tail = ("        // TODO: Handle case when entity not found", f"        return {entity_type}();")
+    
+    lines.append("        for (const auto& entity : entities) {")
+    lines.append(f"            if (entity.{variable_name} == {parameter_name}) {{")
+    lines.append(on_match)
+    lines.append("            }")
+    lines.append("        }")
+    lines.extend(tail)
+    lines.append("    }")
+    
+    code = "\n".join(lines)
     
     return code
 
 
+# Implementation generator of each supported action, keyed on the lowercased action.
+# All take (access_modifier, return_type, method_name, parameter_declaration,
+# variable_name, parameter_name, entity_type).
+_ACTION_GENERATORS = {
+    'find': generate_find_implementation,
+}
+
+
 def generate_method_implementation(action: str, variable_name: str, parameter_name: str, 
                                   function_signature: str, entity_type: str = "Entity") -> Optional[str]:
     """
@@ -173,6 +254,11 @@ def generate_method_implementation(action: str, variable_name: str, parameter_na
     if not action or not variable_name or not parameter_name or not function_signature:
         return None
     
+    # Generator for the action; other actions are not yet implemented
+    generate = _ACTION_GENERATORS.get(action.lower())
+    if generate is None:
+        return None
+    
     # Parse function signature
     access_modifier, return_type, method_name, parameter_declaration = parse_function_signature(function_signature)
     
@@ -183,17 +269,12 @@ def generate_method_implementation(action: str, variable_name: str, parameter_na
     # Extract the type part and rebuild with new parameter name
     if parameter_declaration:
         # Find the last identifier (current parameter name) and replace it
-        param_pattern = r'([A-Za-z_][A-Za-z0-9_]*)\s*$'
-        parameter_declaration = re.sub(param_pattern, parameter_name, parameter_declaration)
+        parameter_declaration = _replace_last_identifier(parameter_declaration, parameter_name)
     
     # Generate implementation based on action
-    if action.lower() == "find":
-        return generate_find_implementation(access_modifier or "Public Virtual", return_type, 
-                                           method_name, parameter_declaration or "", 
-                                           variable_name, parameter_name, entity_type)
-    else:
-        # Other actions not yet implemented
-        return None
+    return generate(access_modifier or "Public Virtual", return_type, 
+                    method_name, parameter_declaration or "", 
+                    variable_name, parameter_name, entity_type)
 
 
 def main():
@@ -22,8 +22,10 @@ import os
 import sys
 import subprocess
 import re
+import functools
+from collections import namedtuple
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
 
 # Add current directory to path for imports
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -35,6 +37,110 @@ from extract_method_action import extract_method_action
 from extract_parameter_name import extract_parameter_name
 from extract_entity_type import extract_entity_type
 from generate_method_implementation import generate_method_implementation
+from _text_utils import read_source_bytes, source_version, decode_source, strip_comments_cached
+from repository_parser import scan_repository_declarations, split_template_args
+
+# A whole word followed by an opening parenthesis, for the method index
+_CALLED_NAME_RE = re.compile(r'\b(\w+)\s*\(')
+_NAME_RE = re.compile(r'\w+')
+# Class body after the closing '>' of the CpaRepository template arguments
+_CLASS_BODY_RE = re.compile(r'\s*{(.*?)};', re.DOTALL)
+
+
+# What generate_context_implementation needs from a repository file, parsed once:
+#   repository_file: path of the file;
+#   entity_type: the entity type of the repository ("Entity" if it could not be extracted);
+#   method_names: the methods of the repository class, in declaration order;
+#   method_index: method name -> declaration line (see _build_method_index)
+RepositoryContext = namedtuple('RepositoryContext', 'repository_file entity_type method_names method_index')
+
+# The inputs generate_method_implementation needs for one custom method
+# (a tuple of (action, variable_name, parameter_name, method_declaration))
+MethodInfo = namedtuple('MethodInfo', 'action variable_name parameter_name method_declaration')
+
+
+@functools.lru_cache(maxsize=128)
+def _class_body_patterns(class_name: str) -> Tuple[Pattern, Pattern]:
+    """
+    Compiled (body_pattern, header_pattern) for class_name.
+    
+    The first captures the body of class_name : public CpaRepository<...>; the second
+    matches the declaration up to the '<', for template arguments with nested angle
+    brackets, which the first cannot match (as in extract_repository_methods).
+    """
+    return (re.compile(rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<\s*[^>]+\s*>\s*{{(.*?)}};', re.DOTALL),
+            re.compile(rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<'))
+
+
+@functools.lru_cache(maxsize=256)
+def _method_call_pattern(method_name: str) -> Pattern:
+    """Compiled pattern matching method_name followed by an opening parenthesis."""
+    return re.compile(rf'\b{re.escape(method_name)}\s*\(')
+
+
+@functools.lru_cache(maxsize=64)
+def _load_class_body(raw: bytes) -> Optional[str]:
+    """
+    Body of the repository class of a file, memoized on the file bytes.
+    
+    Args:
+        raw: Repository file content as bytes
+        
+    Returns:
+        The text between the braces of the class named by DefineStandardPointers,
+        with comments removed, or None if there is no such class
+        
+    Raises:
+        UnicodeDecodeError: If raw is not valid UTF-8
+    """
+    # Remove comments for pattern matching
+    content_no_comments = strip_comments_cached(decode_source(raw))
+    
+    # Class name from DefineStandardPointers, taken from the declarations scan
+    # detect_repository and extract_entity_type already ran on this text
+    class_name = scan_repository_declarations(content_no_comments).define_name
+    if class_name is None:
+        return None
+    
+    # Extract class body
+    body_pattern, header_pattern = _class_body_patterns(class_name)
+    class_match = body_pattern.search(content_no_comments)
+    if class_match:
+        return class_match.group(1)
+    
+    # Template arguments with nested angle brackets: CpaRepository<Pair<K, V>, int>
+    for header in header_pattern.finditer(content_no_comments):
+        split = split_template_args(content_no_comments, header.end())
+        if split:
+            body_match = _CLASS_BODY_RE.match(content_no_comments, split[1])
+            if body_match:
+                return body_match.group(1)
+    
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _build_method_index(raw: bytes) -> Optional[Dict[str, str]]:
+    """
+    Map every name followed by an opening parenthesis in the repository class body
+    to the first (stripped) line it appears on, memoized on the file bytes.
+    
+    One pass over the class body answers get_method_declaration for all the
+    methods of the repository, instead of one scan of the file per method.
+    
+    Returns:
+        Dictionary of name -> declaration line, or None if there is no repository class
+    """
+    class_body = _load_class_body(raw)
+    if class_body is None:
+        return None
+    
+    index = {}
+    for line in class_body.split('\n'):
+        stripped = line.strip()
+        for match in _CALLED_NAME_RE.finditer(stripped):
+            index.setdefault(match.group(1), stripped)
+    return index
 
 
 def get_method_declaration(repository_file: str, method_name: str) -> Optional[str]:
@@ -48,58 +154,50 @@ def get_method_declaration(repository_file: str, method_name: str) -> Optional[s
     Returns:
         Full method declaration string, or None if not found
     """
+    is_name = _NAME_RE.fullmatch(method_name) is not None
     try:
-        with open(repository_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        raw = read_source_bytes(repository_file)
+        if is_name:
+            method_index = _build_method_index(raw)
+        else:
+            class_body = _load_class_body(raw)
     except Exception as e:
         print(f"Error reading file {repository_file}: {e}", file=sys.stderr)
         return None
     
-    # Remove comments for pattern matching
-    content_no_comments = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-    content_no_comments = re.sub(r'/\*.*?\*/', '', content_no_comments, flags=re.DOTALL)
+    if is_name:
+        # The exact method name (word boundary) followed by an opening parenthesis
+        return method_index.get(method_name) if method_index is not None else None
     
-    # Extract class content
-    class_name_match = re.search(r'DefineStandardPointers\s*\(\s*(\w+)\s*\)', content_no_comments)
-    if not class_name_match:
+    # Not a plain identifier, so not in the index: search line by line
+    if class_body is None:
         return None
     
-    class_name = class_name_match.group(1)
-    
-    # Extract class body
-    class_pattern = rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<\s*[^>]+\s*>\s*{{(.*?)}};'
-    class_match = re.search(class_pattern, content_no_comments, re.DOTALL)
-    if not class_match:
-        return None
-    
-    class_body = class_match.group(1)
-    
-    # Find method declaration - look for method name followed by opening parenthesis
-    # Use a simpler approach: search line by line for the method name
-    lines = class_body.split('\n')
-    for line in lines:
+    method_pattern = _method_call_pattern(method_name)
+    for line in class_body.split('\n'):
         stripped = line.strip()
         # Check if this line contains the method name followed by opening parenthesis
-        # Make sure it's the exact method name (word boundary)
-        if re.search(rf'\b{re.escape(method_name)}\s*\(', stripped):
+        if method_pattern.search(stripped):
             return stripped
     
     return None
 
 
-def extract_method_info(repository_file: str, method_name: str) -> Optional[Tuple[str, str, str, str]]:
+@functools.lru_cache(maxsize=1024)
+def _method_info(method_name: str, method_declaration: Optional[str]) -> Optional[MethodInfo]:
     """
-    Extract all information needed to generate method implementation.
+    Extract the implementation inputs of a method from its declaration.
+    
+    Memoized: the three extractions only depend on the name and the declaration,
+    and repositories repeat the same declarations (FindById, Save, ...).
     
     Args:
-        repository_file: Path to repository file
         method_name: Name of the method
+        method_declaration: The method's declaration line, or None if it was not found
         
     Returns:
-        Tuple of (action, variable_name, parameter_name, method_declaration) or None
+        MethodInfo(action, variable_name, parameter_name, method_declaration) or None
     """
-    # Get method declaration
-    method_declaration = get_method_declaration(repository_file, method_name)
     if not method_declaration:
         return None
     
@@ -121,18 +219,34 @@ def extract_method_info(repository_file: str, method_name: str) -> Optional[Tupl
     if not parameter_name:
         return None
     
-    return (action, variable_name, parameter_name, method_declaration)
+    return MethodInfo(action, variable_name, parameter_name, method_declaration)
 
 
-def generate_repository_implementation(repository_file: str) -> Optional[str]:
+def extract_method_info(repository_file: str, method_name: str) -> Optional[MethodInfo]:
     """
-    Generate complete repository implementation body.
+    Extract all information needed to generate method implementation.
     
     Args:
         repository_file: Path to repository file
+        method_name: Name of the method
         
     Returns:
-        Complete implementation code for all custom methods, or None on error
+        MethodInfo(action, variable_name, parameter_name, method_declaration) or None
+    """
+    # Get method declaration
+    method_declaration = get_method_declaration(repository_file, method_name)
+    return _method_info(method_name, method_declaration)
+
+
+def build_context(repository_file: str) -> RepositoryContext:
+    """
+    Parse a repository file once for generate_context_implementation.
+    
+    Args:
+        repository_file: Path to repository file
+        
+    Returns:
+        RepositoryContext of the file
     """
     # Extract entity type from repository
     entity_type = extract_entity_type(repository_file)
@@ -142,15 +256,33 @@ def generate_repository_implementation(repository_file: str) -> Optional[str]:
     
     # Extract all methods from repository
     method_names = extract_repository_methods(repository_file)
-    if not method_names:
-        return None
     
-    implementations = []
+    # Declarations of all the methods in one pass (method names are identifiers,
+    # so the index holds every declaration get_method_declaration would find)
+    method_index = None
+    if method_names:
+        try:
+            method_index = _build_method_index(read_source_bytes(repository_file))
+        except Exception as e:
+            print(f"Error reading file {repository_file}: {e}", file=sys.stderr)
     
+    return RepositoryContext(repository_file, entity_type, tuple(method_names), method_index or {})
+
+
+def iter_repository_implementations(context: RepositoryContext) -> Iterator[str]:
+    """
+    Generate the implementation of each custom method of a parsed repository, in order.
+    
+    Args:
+        context: RepositoryContext from build_context
+        
+    Yields:
+        Implementation code of one method
+    """
     # Process each method
-    for method_name in method_names:
+    for method_name in context.method_names:
         # Extract method info
-        method_info = extract_method_info(repository_file, method_name)
+        method_info = _method_info(method_name, context.method_index.get(method_name))
         if not method_info:
             continue
         
@@ -162,17 +294,60 @@ def generate_repository_implementation(repository_file: str) -> Optional[str]:
             variable_name, 
             parameter_name, 
             method_declaration,
-            entity_type
+            context.entity_type
         )
         
         if code:
-            implementations.append(code)
+            yield code
+
+
+def generate_context_implementation(context: RepositoryContext) -> Optional[str]:
+    """
+    Generate complete repository implementation body from a parsed repository.
     
+    Args:
+        context: RepositoryContext from build_context
+        
+    Returns:
+        Complete implementation code for all custom methods, or None on error
+    """
     # Concatenate all implementations
-    if implementations:
-        return '\n\n'.join(implementations)
+    implementation_code = '\n\n'.join(iter_repository_implementations(context))
     
-    return None
+    return implementation_code or None
+
+
+def generate_repository_implementation(repository_file: str) -> Optional[str]:
+    """
+    Generate complete repository implementation body.
+    
+    Args:
+        repository_file: Path to repository file
+        
+    Returns:
+        Complete implementation code for all custom methods, or None on error
+    """
+    try:
+        version = source_version(repository_file)
+    except FileNotFoundError:
+        # No file, no methods to implement
+        return None
+    except OSError:
+        # Cannot be stat'ed: nothing to cache on, let the extraction report the error
+        return generate_context_implementation(build_context(repository_file))
+    
+    return _generate_for_version(repository_file, version)
+
+
+@functools.lru_cache(maxsize=256)
+def _generate_for_version(repository_file: str, version: Tuple[str, int, int]) -> Optional[str]:
+    """
+    generate_repository_implementation of one version of a file (see source_version).
+    
+    A file generated again while unchanged, e.g. by a driver that visits it more
+    than once, costs a dictionary lookup; rewriting the file changes the key.
+    """
+    return generate_context_implementation(build_context(repository_file))
 
 
 def main():
@@ -187,10 +362,15 @@ def main():
         print(f"Error: Repository file not found: {repository_file}", file=sys.stderr)
         sys.exit(1)
     
-    implementation_code = generate_repository_implementation(repository_file)
+    # Write each implementation as it is generated instead of joining them first
+    separator = ''
+    for code in iter_repository_implementations(build_context(repository_file)):
+        sys.stdout.write(separator)
+        sys.stdout.write(code)
+        separator = '\n\n'
     
-    if implementation_code:
-        print(implementation_code)
+    if separator:
+        sys.stdout.write('\n')
         sys.exit(0)
     else:
         print(f"No custom methods found or could not generate implementation for {repository_file}", file=sys.stderr)
@@ -199,6 +379,11 @@ def main():
 
 # Export functions for other scripts to import
 __all__ = [
+    'RepositoryContext',
+    'MethodInfo',
+    'build_context',
+    'generate_context_implementation',
+    'iter_repository_implementations',
     'generate_repository_implementation',
     'extract_method_info',
     'get_method_declaration',
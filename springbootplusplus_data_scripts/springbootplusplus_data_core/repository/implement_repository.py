@@ -8,7 +8,6 @@ If it exists, creates a <class-name>Impl.h file in src/repository folder.
 
 import os
 import sys
-from pathlib import Path
 from typing import Optional, Tuple
 
 # Add parent directory to path for imports
@@ -20,110 +19,13 @@ from detect_repository import detect_repository
 from generate_repository_implementation import generate_repository_implementation
 
 
-def generate_impl_class(class_name: str, entity_type: str, id_type: str, source_file_path: str, is_templated: bool = True) -> str:
-    """
-    Generate the implementation class code.
-    
-    Args:
-        class_name: Name of the repository class
-        entity_type: Entity type (first template parameter or concrete type)
-        id_type: ID type (second template parameter or concrete type)
-        source_file_path: Absolute path to the source file containing the repository
-        is_templated: Whether the repository class is templated
-        
-    Returns:
-        String containing the complete class implementation
-    """
-    impl_class_name = f"{class_name}Impl"
-    header_guard = f"_{impl_class_name.upper()}_H_"
-    
-    # Use the absolute path of the source file for the include
-    source_path = Path(source_file_path).resolve()
-    include_path = str(source_path)
-    
-    repository_ptr = f"{class_name}Ptr"
-    
-    # Generate base method implementations that delegate to CpaRepositoryImpl
-    if is_templated:
-        # Templated repository: use template parameters
-        base_method_implementations = f"""    Public Virtual Entity Save(Entity& entity) override {{
-        return CpaRepositoryImpl<Entity, ID>::Save(entity);
-    }}
-
-    Public Virtual optional<Entity> FindById(ID id) override {{
-        return CpaRepositoryImpl<Entity, ID>::FindById(id);
-    }}
-
-    Public Virtual StdVector<Entity> FindAll() override {{
-        return CpaRepositoryImpl<Entity, ID>::FindAll();
-    }}
-
-    Public Virtual Entity Update(Entity& entity) override {{
-        return CpaRepositoryImpl<Entity, ID>::Update(entity);
-    }}
+# Skeletons of the generated <ClassName>Impl.h, filled in by generate_impl_class with
+# str.format_map ({name} placeholders; the braces of the C++ code are doubled).
+# Templated and concrete repositories share them: {entity_type} and {id_type} are
+# the Entity and ID template parameters or the concrete types.
 
-    Public Virtual Void DeleteById(ID id) override {{
-        CpaRepositoryImpl<Entity, ID>::DeleteById(id);
-    }}
-
-    Public Virtual Void Delete(Entity& entity) override {{
-        CpaRepositoryImpl<Entity, ID>::Delete(entity);
-    }}
-
-    Public Virtual Bool ExistsById(ID id) override {{
-        return CpaRepositoryImpl<Entity, ID>::ExistsById(id);
-    }}"""
-        
-        # Generate custom method implementations (FindBy, DeleteBy, etc.)
-        custom_method_implementations = None
-        try:
-            if os.path.exists(source_file_path):
-                custom_method_implementations = generate_repository_implementation(source_file_path)
-        except Exception as e:
-            # If custom method generation fails, continue with base methods only
-            # print(f"Warning: Could not generate custom methods: {e}", file=sys.stderr)
-            pass
-        
-        if custom_method_implementations:
-            # Add custom methods after base methods
-            method_implementations = base_method_implementations + "\n\n" + custom_method_implementations
-        else:
-            method_implementations = base_method_implementations
-        
-        # Add GetInstance and template specializations
-        method_implementations += f"""
-
-    Public Static {repository_ptr} GetInstance() {{
-        static {repository_ptr} instance(new {impl_class_name}<Entity, ID>());
-        return instance;
-    }}
-
-}};
-
-template <typename Entity, typename ID>
-struct Implementation<{class_name}<Entity, ID>> {{
-    using type = {impl_class_name}<Entity, ID>;
-}};
-
-template <typename Entity, typename ID>
-struct Implementation<{class_name}<Entity, ID>*> {{
-    using type = {impl_class_name}<Entity, ID>*;
-}};
-"""
-        code = f"""#ifndef {header_guard}
-#define {header_guard}
-
-#include "CpaRepositoryImpl.h"
-
-template<typename Entity, typename ID>
-class {impl_class_name} : public {class_name}<Entity, ID>, public CpaRepositoryImpl<Entity, ID> {{
-    Public Virtual ~{impl_class_name}() = default;
-{method_implementations}
-#endif // {header_guard}
-"""
-    else:
-        # Non-templated repository: use concrete types
-        base_method_implementations = f"""    Public Virtual {entity_type} Save({entity_type}& entity) override {{
+# Base methods, delegating to CpaRepositoryImpl
+_BASE_METHODS_TEMPLATE = """    Public Virtual {entity_type} Save({entity_type}& entity) override {{
         return CpaRepositoryImpl<{entity_type}, {id_type}>::Save(entity);
     }}
 
@@ -150,54 +52,140 @@ class {impl_class_name} : public {class_name}<Entity, ID>, public CpaRepositoryI
     Public Virtual Bool ExistsById({id_type} id) override {{
         return CpaRepositoryImpl<{entity_type}, {id_type}>::ExistsById(id);
     }}"""
-        
-        # Generate custom method implementations (FindBy, DeleteBy, etc.)
-        custom_method_implementations = None
-        try:
-            if os.path.exists(source_file_path):
-                custom_method_implementations = generate_repository_implementation(source_file_path)
-        except Exception as e:
-            # If custom method generation fails, continue with base methods only
-            # print(f"Warning: Could not generate custom methods: {e}", file=sys.stderr)
-            pass
-        
-        if custom_method_implementations:
-            # Add custom methods after base methods
-            method_implementations = base_method_implementations + "\n\n" + custom_method_implementations
-        else:
-            method_implementations = base_method_implementations
-        
-        # Add GetInstance and template specializations
-        method_implementations += f"""
+
+# Implementation class, with GetInstance and the Implementation<...> specializations.
+# {class_template} is the template<...> line of the class (empty if not templated),
+# {template_arguments} the <Entity, ID> after the class names and
+# {specialization_parameters} the template parameters of the specializations.
+_IMPL_TEMPLATE = """#ifndef {header_guard}
+#define {header_guard}
+
+#include "CpaRepositoryImpl.h"
+
+{class_template}class {impl_class_name} : public {class_name}{template_arguments}, public CpaRepositoryImpl<{entity_type}, {id_type}> {{
+    Public Virtual ~{impl_class_name}() = default;
+{method_implementations}
 
     Public Static {repository_ptr} GetInstance() {{
-        static {repository_ptr} instance(new {impl_class_name}());
+        static {repository_ptr} instance(new {impl_class_name}{template_arguments}());
         return instance;
     }}
 
 }};
 
-template <>
-struct Implementation<{class_name}> {{
-    using type = {impl_class_name};
+template <{specialization_parameters}>
+struct Implementation<{class_name}{template_arguments}> {{
+    using type = {impl_class_name}{template_arguments};
 }};
 
-template <>
-struct Implementation<{class_name}*> {{
-    using type = {impl_class_name}*;
+template <{specialization_parameters}>
+struct Implementation<{class_name}{template_arguments}*> {{
+    using type = {impl_class_name}{template_arguments}*;
 }};
-"""
-        code = f"""#ifndef {header_guard}
-#define {header_guard}
 
-#include "CpaRepositoryImpl.h"
-
-class {impl_class_name} : public {class_name}, public CpaRepositoryImpl<{entity_type}, {id_type}> {{
-    Public Virtual ~{impl_class_name}() = default;
-{method_implementations}
 #endif // {header_guard}
 """
-    return code
+
+# Template-dependent parts of the skeletons for a templated repository
+_TEMPLATED_PARTS = {
+    'entity_type': 'Entity',
+    'id_type': 'ID',
+    'class_template': 'template<typename Entity, typename ID>\n',
+    'template_arguments': '<Entity, ID>',
+    'specialization_parameters': 'typename Entity, typename ID',
+}
+
+# Base methods of a templated repository: constant, as they only use the template parameters
+_TEMPLATED_BASE_METHODS = _BASE_METHODS_TEMPLATE.format_map(_TEMPLATED_PARTS)
+
+
+def generate_impl_class(class_name: str, entity_type: str, id_type: str, source_file_path: str, is_templated: bool = True) -> str:
+    """
+    Generate the implementation class code.
+    
+    Args:
+        class_name: Name of the repository class
+        entity_type: Entity type (first template parameter or concrete type)
+        id_type: ID type (second template parameter or concrete type)
+        source_file_path: Absolute path to the source file containing the repository
+        is_templated: Whether the repository class is templated
+        
+    Returns:
+        String containing the complete class implementation
+    """
+    impl_class_name = f"{class_name}Impl"
+    header_guard = f"_{impl_class_name.upper()}_H_"
+    
+    repository_ptr = f"{class_name}Ptr"
+    
+    # Generate base method implementations that delegate to CpaRepositoryImpl
+    if is_templated:
+        # Templated repository: use template parameters
+        parts = dict(_TEMPLATED_PARTS)
+        base_method_implementations = _TEMPLATED_BASE_METHODS
+    else:
+        # Non-templated repository: use concrete types
+        parts = {
+            'entity_type': entity_type,
+            'id_type': id_type,
+            'class_template': '',
+            'template_arguments': '',
+            'specialization_parameters': '',
+        }
+        base_method_implementations = _BASE_METHODS_TEMPLATE.format_map(parts)
+    
+    # Generate custom method implementations (FindBy, DeleteBy, etc.)
+    custom_method_implementations = None
+    try:
+        # A missing source file simply yields no custom methods
+        custom_method_implementations = generate_repository_implementation(source_file_path)
+    except Exception as e:
+        # If custom method generation fails, continue with base methods only
+        # print(f"Warning: Could not generate custom methods: {e}", file=sys.stderr)
+        pass
+    
+    method_implementations = [base_method_implementations]
+    if custom_method_implementations:
+        # Add custom methods after base methods
+        method_implementations.append(custom_method_implementations)
+    
+    # Fill in the header skeleton (GetInstance and template specializations included)
+    parts.update(
+        header_guard=header_guard,
+        class_name=class_name,
+        impl_class_name=impl_class_name,
+        repository_ptr=repository_ptr,
+        method_implementations="\n\n".join(method_implementations),
+    )
+    return _IMPL_TEMPLATE.format_map(parts)
+
+
+def _write_text_file(file_path: str, text: str) -> None:
+    """
+    Write text to a file in one system call, without a text I/O wrapper.
+    
+    Same bytes as open(file_path, 'w', encoding='utf-8').write(text): newlines are
+    translated to os.linesep, and the file is created with the same permissions.
+    
+    Args:
+        file_path: Path of the file to create or overwrite
+        text: Content to write
+        
+    Raises:
+        OSError: If the file cannot be opened or written
+    """
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    data = memoryview(text.encode('utf-8'))
+    
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(file_path, flags, 0o666)
+    try:
+        # A single write normally takes everything; loop for the rare partial write
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 
 def implement_repository(file_path: str, library_dir: str, dry_run: bool = False, repository_info: Optional[Tuple[str, str, str, bool]] = None) -> bool:
@@ -231,15 +219,15 @@ def implement_repository(file_path: str, library_dir: str, dry_run: bool = False
         is_templated = True
     
     # Create repository directory if it doesn't exist
-    repository_dir = Path(library_dir) / "src" / "repository"
-    repository_dir.mkdir(parents=True, exist_ok=True)
+    repository_dir = os.path.join(library_dir, "src", "repository")
+    os.makedirs(repository_dir, exist_ok=True)
     
     # Generate implementation file name
     impl_file_name = f"{class_name}Impl.h"
-    impl_file_path = repository_dir / impl_file_name
+    impl_file_path = os.path.join(repository_dir, impl_file_name)
     
     # Check if file already exists
-    if impl_file_path.exists():
+    if os.path.exists(impl_file_path):
         # print(f"⚠️  Implementation file already exists: {impl_file_path}")
         return False
     
@@ -255,8 +243,7 @@ def implement_repository(file_path: str, library_dir: str, dry_run: bool = False
     
     # Write the implementation file
     try:
-        with open(impl_file_path, 'w', encoding='utf-8') as f:
-            f.write(impl_code)
+        _write_text_file(impl_file_path, impl_code)
         # print(f"✓ Created implementation file: {impl_file_path}")
         return True
     except Exception as e:
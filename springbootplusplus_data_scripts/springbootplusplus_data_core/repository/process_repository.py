@@ -13,8 +13,9 @@ This script:
 import os
 import sys
 import re
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Pattern, Tuple
 
 # Add parent directory to path for imports
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,6 +23,63 @@ sys.path.insert(0, str(script_dir))
 
 from detect_repository import detect_repository
 from implement_repository import implement_repository, generate_impl_class
+from _text_utils import read_source_bytes, decode_source, strip_comments_cached
+from repository_parser import scan_repository_declarations, is_templated_class, find_repository_types
+
+# Precompiled patterns (compiled once at import instead of on every line)
+# #endif, with an optional // or /* */ comment after it
+_ENDIF_RE = re.compile(r'^\s*#endif\s*(//.*|/\*.*\*/)?\s*$')
+# /// @Repository or ///@Repository annotation line (stripped)
+_REPOSITORY_ANNOTATION_RE = re.compile(r'^///\s*@Repository\s*$')
+# Processed annotation line (stripped): /* @Repository */
+_PROCESSED_ANNOTATION_LINE_RE = re.compile(r'^/\*\s*@Repository\s*\*/\s*$')
+# Processed annotation anywhere in the file
+_PROCESSED_ANNOTATION_RE = re.compile(r'/\*\s*@Repository\s*\*/')
+_DEFINE_STANDARD_POINTERS_RE = re.compile(r'DefineStandardPointers\s*\(\s*(\w+)\s*\)')
+
+# Name of the file_cache of the files without a repository (see process_repositories)
+_SETTLED_CACHE_NAME = "repository_headers"
+
+
+@functools.lru_cache(maxsize=512)
+def _include_pattern(include_path: str) -> Pattern:
+    """Compiled pattern matching an #include of include_path ("..." or <...>)."""
+    return re.compile(rf'#include\s+["<]{re.escape(include_path)}[">]')
+
+
+def _line_bounds(content: str, pos: int) -> Tuple[int, int]:
+    """Start and end offsets (end excludes the newline) of the line holding content[pos]."""
+    start = content.rfind('\n', 0, pos) + 1
+    end = content.find('\n', pos)
+    if end == -1:
+        end = len(content)
+    return start, end
+
+
+def _find_last_endif_offset(content: str) -> Optional[int]:
+    """
+    Find where the line of the last #endif starts in the file content.
+    
+    Only the #endif occurrences are visited, from the end, instead of splitting
+    the whole content into lines.
+    
+    Args:
+        content: File content as string
+        
+    Returns:
+        Offset of the first character of the last #endif line, or None if not found
+    """
+    pos = content.rfind('#endif')
+    while pos != -1:
+        start, end = _line_bounds(content, pos)
+        # Check for #endif (with optional comment after it)
+        # Match patterns like: #endif, #endif // comment, #endif/*comment*/
+        if _ENDIF_RE.match(content[start:end].strip()):
+            return start
+        # Earlier #endif on the same line do not matter: the whole line was checked
+        pos = content.rfind('#endif', 0, start)
+    
+    return None
 
 
 def find_last_endif_position(content: str) -> Optional[int]:
@@ -34,19 +92,104 @@ def find_last_endif_position(content: str) -> Optional[int]:
     Returns:
         Line number (1-based) of the last #endif, or None if not found
     """
-    lines = content.split('\n')
-    last_endif_line = None
+    offset = _find_last_endif_offset(content)
+    if offset is None:
+        return None
     
-    # Search from the end
-    for i in range(len(lines) - 1, -1, -1):
-        line = lines[i].strip()
-        # Check for #endif (with optional comment after it)
-        # Match patterns like: #endif, #endif // comment, #endif/*comment*/
-        if re.match(r'^\s*#endif\s*(//.*|/\*.*\*/)?\s*$', line):
-            last_endif_line = i + 1  # 1-based line number
-            break
+    return content.count('\n', 0, offset) + 1
+
+
+def _find_annotation_line(content: str, pattern: Pattern) -> Optional[Tuple[int, int]]:
+    """
+    Find the first line holding @Repository whose stripped text matches pattern.
     
-    return last_endif_line
+    Returns:
+        (start, end) offsets of the line (see _line_bounds), or None if not found
+    """
+    pos = content.find('@Repository')
+    while pos != -1:
+        start, end = _line_bounds(content, pos)
+        if pattern.match(content[start:end].strip()):
+            return start, end
+        pos = content.find('@Repository', end)
+    
+    return None
+
+
+def insert_include(content: str, include_path: str) -> Optional[str]:
+    """
+    Add an include statement to repository file content.
+    Adds it just before the last #endif, or at the end if no #endif exists.
+    
+    Args:
+        content: Repository file content as string
+        include_path: Path to include (relative or absolute)
+        
+    Returns:
+        The content with the include added, or None if the include already exists
+    """
+    # Check if include already exists (the path itself has to be in the content first)
+    if include_path in content and _include_pattern(include_path).search(content):
+        return None
+    
+    # Find where the last #endif line starts
+    last_endif_offset = _find_last_endif_offset(content)
+    
+    include_statement = f'#include "{include_path}"'
+    
+    # Add the include, splicing it into the content instead of re-joining all the lines
+    if last_endif_offset is not None:
+        # Insert before the last #endif
+        return content[:last_endif_offset] + include_statement + '\n' + content[last_endif_offset:]
+    
+    # Add at the end
+    return content + '\n' + include_statement
+
+
+def mark_repository_annotation(content: str) -> Optional[str]:
+    """
+    Replace the @Repository annotation with processed marker in repository file content.
+    
+    Args:
+        content: Repository file content as string
+        
+    Returns:
+        The content with the annotation marked as processed, the content itself if
+        it was already processed, or None if there is no annotation
+    """
+    # Find and replace @Repository annotation
+    # (/// @Repository or ///@Repository, ignoring whitespace)
+    annotation = _find_annotation_line(content, _REPOSITORY_ANNOTATION_RE)
+    
+    if annotation is None:
+        # Check if already processed (/* @Repository */)
+        if _find_annotation_line(content, _PROCESSED_ANNOTATION_LINE_RE) is not None:
+            return content
+        return None
+    
+    # Replace with processed marker, preserving original indentation
+    start, end = annotation
+    line = content[start:end]
+    if line.startswith(' '):
+        # Has indentation, preserve it
+        indent = len(line) - len(line.lstrip())
+        marker = ' ' * indent + '/* @Repository */'
+    else:
+        # No indentation
+        marker = '/* @Repository */'
+    
+    return content[:start] + marker + content[end:]
+
+
+def _write_content(file_path: str, content: str) -> bool:
+    """Write content back to a file; True on success."""
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return True
+    except Exception as e:
+        # print(f"Error writing file {file_path}: {e}")
+        return False
 
 
 def add_include_to_file(file_path: str, include_path: str, dry_run: bool = False) -> bool:
@@ -63,50 +206,27 @@ def add_include_to_file(file_path: str, include_path: str, dry_run: bool = False
         True if include was added (or would be added), False otherwise
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        raw = read_source_bytes(file_path)
+        # The exact #include "..." line already there: nothing to decode or add
+        if f'#include "{include_path}"'.encode('utf-8') in raw:
+            return False
+        content = decode_source(raw)
     except Exception as e:
         # print(f"Error reading file {file_path}: {e}")
         return False
     
-    # Check if include already exists
-    escaped_include = re.escape(include_path)
-    if re.search(rf'#include\s+["<]{escaped_include}[">]', content):
+    new_content = insert_include(content, include_path)
+    if new_content is None:
         # print(f"⚠️  Include for {include_path} already exists in {file_path}")
         return False
     
-    # Find the last #endif
-    last_endif_line = find_last_endif_position(content)
-    
-    lines = content.split('\n')
-    include_statement = f'#include "{include_path}"'
-    
     if dry_run:
-        # if last_endif_line:
-        #     print(f"Would add include before line {last_endif_line} (last #endif)")
-        # else:
-        #     print(f"Would add include at the end of file (no #endif found)")
-        # print(f"  {include_statement}")
+        # print(f"Would add include: #include \"{include_path}\"")
         return True
     
-    # Add the include
-    if last_endif_line:
-        # Insert before the last #endif
-        insert_index = last_endif_line - 1  # Convert to 0-based
-        lines.insert(insert_index, include_statement)
-    else:
-        # Add at the end
-        lines.append(include_statement)
-    
     # Write back to file
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
-        # print(f"✓ Added include to {file_path}: {include_path}")
-        return True
-    except Exception as e:
-        # print(f"Error writing file {file_path}: {e}")
-        return False
+    # print(f"✓ Added include to {file_path}: {include_path}")
+    return _write_content(file_path, new_content)
 
 
 def comment_repository_annotation(file_path: str, dry_run: bool = False) -> bool:
@@ -121,60 +241,37 @@ def comment_repository_annotation(file_path: str, dry_run: bool = False) -> bool
         True if annotation was processed (or would be processed), False otherwise
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        raw = read_source_bytes(file_path)
+        # No annotation at all: nothing to decode
+        if b'@Repository' not in raw:
+            return False
+        content = decode_source(raw)
     except Exception as e:
         # print(f"Error reading file {file_path}: {e}")
         return False
     
-    lines = content.split('\n')
-    modified = False
-    
-    # Find and replace @Repository annotation
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        # Check for /// @Repository or ///@Repository annotation (ignoring whitespace)
-        if re.match(r'^///\s*@Repository\s*$', stripped):
-            # Replace with processed marker, preserving original indentation
-            if line.startswith(' '):
-                # Has indentation, preserve it
-                indent = len(line) - len(line.lstrip())
-                lines[i] = ' ' * indent + '/* @Repository */'
-            else:
-                # No indentation
-                lines[i] = '/* @Repository */'
-            modified = True
-            # print(f"✓ Found @Repository annotation on line {i+1}, marking as processed")
-            break
-    
-    if not modified:
-        # Check if already processed
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            # Check for processed version (/* @Repository */)
-            if re.match(r'^/\*\s*@Repository\s*\*/\s*$', stripped):
-                # print(f"✓ @Repository annotation already processed in {file_path} (line {i+1})")
-                return True
-        # Debug: print first few lines to see what we're looking at
+    new_content = mark_repository_annotation(content)
+    if new_content is None:
         # print(f"⚠️  @Repository annotation not found in {file_path}")
-        # print(f"   First 15 lines of file:")
-        # for j, l in enumerate(lines[:15], 1):
-        #     print(f"   {j:2}: {repr(l)}")
         return False
     
+    if new_content == content:
+        # print(f"✓ @Repository annotation already processed in {file_path}")
+        return True
+    
     if dry_run:
         # print(f"Would mark @Repository annotation as processed in {file_path}")
         return True
     
     # Write back to file
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
-        # print(f"✓ Marked @Repository annotation as processed in {file_path}")
-        return True
-    except Exception as e:
-        # print(f"Error writing file {file_path}: {e}")
-        return False
+    # print(f"✓ Marked @Repository annotation as processed in {file_path}")
+    return _write_content(file_path, new_content)
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_cached(path_str: str, cwd: str) -> str:
+    """Path(path_str).resolve() as a string, memoized (cwd: the current directory if path_str is relative)."""
+    return str(Path(path_str).resolve())
 
 
 def calculate_include_path(source_file_path: str, impl_file_path: str) -> str:
@@ -188,10 +285,17 @@ def calculate_include_path(source_file_path: str, impl_file_path: str) -> str:
     Returns:
         Absolute include path
     """
-    impl_path = Path(impl_file_path).resolve()
+    # The implementation files of a run share a few directories: resolve those once.
+    # A file that is itself a symlink is resolved in full, like any odd name.
+    directory, name = os.path.split(impl_file_path)
+    if not directory or name in ('', '.', '..') or os.path.islink(impl_file_path):
+        return str(Path(impl_file_path).resolve())
+    
+    # A relative directory resolves against the current directory, which is part of the key
+    cwd = '' if os.path.isabs(directory) else os.getcwd()
     
     # Return absolute path
-    return str(impl_path)
+    return os.path.join(_resolve_cached(directory, cwd), name)
 
 
 def process_repository(file_path: str, library_dir: str, dry_run: bool = False) -> bool:
@@ -206,7 +310,15 @@ def process_repository(file_path: str, library_dir: str, dry_run: bool = False)
     Returns:
         True if repository was processed successfully, False otherwise
     """
-    # Step 1: Detect repository in the file
+    # Read the file once: detection, the checks below and both edits share this content,
+    # and the file is written back once at the end
+    try:
+        content = decode_source(read_source_bytes(file_path))
+    except Exception as e:
+        # print(f"Error reading file {file_path}: {e}")
+        return False
+    
+    # Step 1: Detect repository in the file (reuses the read above)
     result = detect_repository(file_path)
     
     # If annotation is already processed, check if implementation file exists
@@ -214,26 +326,23 @@ def process_repository(file_path: str, library_dir: str, dry_run: bool = False)
     if not result:
         # Check if annotation is processed but file is missing
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            processed_pattern = r'/\*\s*@Repository\s*\*/'
-            if re.search(processed_pattern, content):
+            if '@Repository' in content and _PROCESSED_ANNOTATION_RE.search(content):
                 # Annotation is processed, check if file exists
-                class_name_match = re.search(r'DefineStandardPointers\s*\(\s*(\w+)\s*\)', content)
+                class_name_match = _DEFINE_STANDARD_POINTERS_RE.search(content)
                 if class_name_match:
                     class_name = class_name_match.group(1)
-                    repository_dir = Path(library_dir) / "src" / "repository"
-                    impl_file_path = repository_dir / f"{class_name}Impl.h"
+                    repository_dir = os.path.join(library_dir, "src", "repository")
+                    impl_file_path = os.path.join(repository_dir, f"{class_name}Impl.h")
                     
-                    if not impl_file_path.exists():
+                    # Without a CpaRepository declaration there is nothing to reprocess,
+                    # so the comments are only stripped when the literal is there
+                    if not os.path.exists(impl_file_path) and 'CpaRepository' in content:
                         # Reprocess by manually extracting the info and creating the file
-                        content_no_comments = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-                        content_no_comments = re.sub(r'/\*.*?\*/', '', content_no_comments, flags=re.DOTALL)
-                        template_match = re.search(rf'class\s+{re.escape(class_name)}\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*<\s*([^,<>]+)\s*,\s*([^,<>]+)\s*>', content_no_comments)
-                        if template_match:
-                            entity_type = template_match.group(1).strip()
-                            id_type = template_match.group(2).strip()
-                            is_templated = bool(re.search(rf'template\s*<\s*[^>]+\s*>\s*class\s+{re.escape(class_name)}', content_no_comments))
+                        declarations = scan_repository_declarations(strip_comments_cached(content))
+                        template_params = find_repository_types(declarations, class_name)
+                        if template_params:
+                            entity_type, id_type = template_params
+                            is_templated = is_templated_class(declarations, class_name)
                             result = (class_name, entity_type, id_type, is_templated)
         except Exception as e:
             pass
@@ -254,39 +363,103 @@ def process_repository(file_path: str, library_dir: str, dry_run: bool = False)
         # print(f"🔍 Found repository: {class_name}<{entity_type}, {id_type}> in {file_path}")
     
     # Step 2: Create the implementation file (or check if it exists)
-    repository_dir = Path(library_dir) / "src" / "repository"
+    repository_dir = os.path.join(library_dir, "src", "repository")
     impl_file_name = f"{class_name}Impl.h"
-    impl_file_path = repository_dir / impl_file_name
+    impl_file_path = os.path.join(repository_dir, impl_file_name)
     
     # Try to create the implementation file
     # Pass repository_info if we manually extracted it (for processed annotations)
     impl_created = implement_repository(file_path, library_dir, dry_run, repository_info=result if result else None)
     
     # Check if implementation file exists (either newly created or already existed)
-    if not dry_run and not impl_file_path.exists():
+    if not dry_run and not os.path.exists(impl_file_path):
         # print(f"⚠️  Implementation file was not created: {impl_file_path}")
         return False
     
     # Step 4: Calculate include path (relative from source file to impl file)
-    include_path = calculate_include_path(file_path, str(impl_file_path))
+    include_path = calculate_include_path(file_path, impl_file_path)
     # print(f"📝 Calculated include path: {include_path}")
     
-    # Step 5: Add include to the original repository file
-    include_added = add_include_to_file(file_path, include_path, dry_run)
+    # Step 5: Add include to the original repository content
+    new_content = insert_include(content, include_path)
     
-    if not include_added:
-        # print(f"⚠️  Failed to add include for repository {class_name}")
+    if new_content is None:
+        # print(f"⚠️  Include for {include_path} already exists, repository {class_name} not processed")
         return False
     
     # Step 6: Mark the @Repository annotation as processed
-    annotation_processed = comment_repository_annotation(file_path, dry_run)
+    # (a missing annotation does not fail the processing: the include is what matters)
+    marked_content = mark_repository_annotation(new_content)
+    if marked_content is not None:
+        new_content = marked_content
+    # else:
+    #     print(f"⚠️  Repository {class_name} processed but annotation marking failed")
     
-    if include_added and annotation_processed:
-        # print(f"✅ Successfully processed repository {class_name}")
+    if dry_run:
         return True
-    else:
-        # print(f"⚠️  Repository {class_name} processed but annotation marking failed")
-        return include_added  # Return True if at least include was added
+    
+    # Write the include and the marker back in a single write
+    # print(f"✅ Successfully processed repository {class_name}")
+    return _write_content(file_path, new_content)
+
+
+def process_repositories(file_paths: Iterable[str], library_dir: str, dry_run: bool = False,
+                         project_dir: Optional[str] = None) -> int:
+    """
+    Process many files with process_repository, skipping those known to hold no repository.
+    
+    A file without "@Repository" has nothing to process. Such files are recorded with
+    their modification time and size in the project's file_cache, and the next build
+    skips them without reading them while they stay unchanged. Errors on one file are
+    reported and do not stop the others.
+    
+    Args:
+        file_paths: Paths to the source files to check
+        library_dir: Path to the library directory (where src/repository folder should be)
+        dry_run: If True, don't actually create or modify files (nor the cache)
+        project_dir: Path to the client project root, where the cache is kept (no cache if None)
+        
+    Returns:
+        Number of repositories processed successfully
+    """
+    core_dir = os.path.dirname(script_dir)
+    if core_dir not in sys.path:
+        sys.path.insert(0, core_dir)
+    from file_cache import file_signature, scripts_fingerprint, load_file_cache, save_file_cache
+    
+    cache_fingerprint = scripts_fingerprint([os.path.abspath(__file__)])
+    settled_cache = load_file_cache(project_dir, _SETTLED_CACHE_NAME, cache_fingerprint)
+    settled = {}
+    
+    implemented_count = 0
+    for file_path in file_paths:
+        file_path = str(file_path)
+        try:
+            signature = file_signature(file_path)
+            if signature is not None:
+                if settled_cache.get(file_path) == signature:
+                    settled[file_path] = signature
+                    continue
+                # Shares the memoized read with process_repository below
+                try:
+                    raw = read_source_bytes(file_path)
+                except OSError:
+                    raw = None
+                if raw is not None and b'@Repository' not in raw:
+                    settled[file_path] = signature
+                    continue
+            
+            # This will detect @Repository annotation, create impl file, and add include
+            if process_repository(file_path, library_dir, dry_run):
+                implemented_count += 1
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+    
+    if not dry_run:
+        save_file_cache(project_dir, _SETTLED_CACHE_NAME, cache_fingerprint, settled)
+    
+    return implemented_count
 
 
 def main():
@@ -297,8 +470,10 @@ def main():
         description="Process repository classes: detect @Repository annotation, create implementation, and add include"
     )
     parser.add_argument(
-        "file_path",
-        help="Path to the C++ file to check"
+        "file_paths",
+        nargs="+",
+        metavar="file_path",
+        help="Path to the C++ file to check (several files are processed in this one run)"
     )
     parser.add_argument(
         "--library-dir",
@@ -313,7 +488,11 @@ def main():
     
     args = parser.parse_args()
     
-    success = process_repository(args.file_path, args.library_dir, args.dry_run)
+    if len(args.file_paths) == 1:
+        success = process_repository(args.file_paths[0], args.library_dir, args.dry_run)
+    else:
+        # One interpreter for the whole batch instead of one per file
+        success = process_repositories(args.file_paths, args.library_dir, args.dry_run) > 0
     
     return 0 if success else 1
 
@@ -321,7 +500,11 @@ def main():
 # Export functions for other scripts to import
 __all__ = [
     'process_repository',
+    'process_repositories',
     'add_include_to_file',
+    'comment_repository_annotation',
+    'insert_include',
+    'mark_repository_annotation',
     'calculate_include_path',
     'main'
 ]
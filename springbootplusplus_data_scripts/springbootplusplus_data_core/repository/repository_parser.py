@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Shared parsing of repository headers.
+
+detect_repository and extract_entity_type both need, from the comment-free text
+of a repository header:
+1. The class named by DefineStandardPointers(ClassName)
+2. Whether that class is declared as template<...> class ClassName
+3. The template parameters of class ClassName : public CpaRepository<Type1, Type2>
+
+scan_repository_declarations collects all three in a single walk over the text
+instead of one regex search per question.
+
+Usage:
+    python repository_parser.py <repository_file_path> [class_name|type1|type2|is_templated|entity_type|methods ...]
+"""
+
+import os
+import re
+import sys
+import functools
+from collections import namedtuple
+from typing import List, Optional, Tuple
+
+# Add current directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from _text_utils import read_source_bytes, decode_source, strip_comments_cached
+
+# The three declarations, each wrapped in a lookahead so that the walk tries every
+# position independently (a template<...> header and the class ... : public
+# CpaRepository<...> following it overlap, and consuming one would hide the other).
+# The alternatives start with different letters, so at most one matches per position:
+#   1. DefineStandardPointers(ClassName)
+#   2. template<...> class ClassName
+#   3. class ClassName (final) : public (virtual) CpaRepository< -- the template
+#      arguments are then read by split_template_args (group 4 marks the '<')
+_DECLARATIONS_RE = re.compile(
+    r'(?=DefineStandardPointers\s*\(\s*(\w+)\s*\)'
+    r'|template\s*<\s*[^>]+\s*>\s*class\s+(\w+)'
+    r'|class\s+(\w+)\s+(?:final\s+)?:\s*public\s+(?:virtual\s+)?CpaRepository\s*(<))'
+)
+# Characters that matter inside a template argument list
+_TEMPLATE_ARG_DELIMITER_RE = re.compile(r'[<>,]')
+
+# Declarations found in a comment-free repository header:
+#   define_name: class name of the first DefineStandardPointers(...), or None;
+#   templated_classes: the word after each template<...> class, in file order;
+#   repositories: (class_name, type1, type2) for each CpaRepository<type1, type2> subclass, in file order
+RepositoryDeclarations = namedtuple('RepositoryDeclarations', 'define_name templated_classes repositories')
+
+
+def split_template_args(text: str, pos: int) -> Optional[Tuple[List[str], int]]:
+    """
+    Split the template argument list that starts just after the '<' at text[pos - 1].
+    
+    Angle brackets are counted, so commas of nested arguments such as
+    CpaRepository<Map<K, V>, int> do not split the outer list.
+    
+    Args:
+        text: Text holding the argument list
+        pos: Position just after the opening '<'
+        
+    Returns:
+        (arguments, end): the unstripped arguments and the position just after the
+        closing '>', or None if the list is not closed or an argument is empty
+    """
+    args = []
+    depth = 1
+    arg_start = pos
+    for delimiter in _TEMPLATE_ARG_DELIMITER_RE.finditer(text, pos):
+        char = delimiter.group()
+        if char == '<':
+            depth += 1
+        elif char == '>':
+            depth -= 1
+            if depth == 0:
+                args.append(text[arg_start:delimiter.start()])
+                break
+        elif depth == 1:
+            args.append(text[arg_start:delimiter.start()])
+            arg_start = delimiter.end()
+    else:
+        return None
+    
+    if not all(args):
+        return None
+    return args, delimiter.end()
+
+
+@functools.lru_cache(maxsize=128)
+def scan_repository_declarations(content_no_comments: str) -> RepositoryDeclarations:
+    """
+    Collect the repository declarations of a header in one pass.
+    
+    Args:
+        content_no_comments: File content with the comments removed
+    
+    Returns:
+        RepositoryDeclarations of the content (memoized on the content)
+    """
+    define_name = None
+    templated_classes = []
+    repositories = []
+    
+    for match in _DECLARATIONS_RE.finditer(content_no_comments):
+        defined, templated, repository = match.group(1, 2, 3)
+        if defined is not None:
+            if define_name is None:
+                define_name = defined
+        elif templated is not None:
+            templated_classes.append(templated)
+        else:
+            split = split_template_args(content_no_comments, match.end(4))
+            if split and len(split[0]) == 2:
+                repositories.append((repository, split[0][0], split[0][1]))
+    
+    return RepositoryDeclarations(define_name, tuple(templated_classes), tuple(repositories))
+
+
+def is_templated_class(declarations: RepositoryDeclarations, class_name: str) -> bool:
+    """
+    Check whether class_name is declared as template<...> class class_name.
+    
+    Like the template<...> class ClassName pattern this replaces, the name only has
+    to start the word following 'class'.
+    """
+    return any(templated.startswith(class_name) for templated in declarations.templated_classes)
+
+
+def find_repository_types(declarations: RepositoryDeclarations, class_name: str) -> Optional[Tuple[str, str]]:
+    """
+    Get the CpaRepository<Type1, Type2> parameters of class_name.
+    
+    Returns:
+        (Type1, Type2) of the first declaration of class_name, or None if it has none
+    """
+    for repository_class, type1, type2 in declarations.repositories:
+        if repository_class == class_name:
+            return (type1.strip(), type2.strip())
+    return None
+
+
+def parse_repository_file(file_path: str) -> Optional[dict]:
+    """
+    Parse the repository class of a header.
+    
+    Args:
+        file_path: Path to the repository file
+    
+    Returns:
+        Dictionary with 'class_name' (from DefineStandardPointers), 'type1', 'type2'
+        (the CpaRepository template parameters) and 'is_templated',
+        or None if the file could not be read or holds no repository class
+    """
+    try:
+        raw = read_source_bytes(file_path)
+        # Not a repository: no need to decode or strip anything
+        if b'DefineStandardPointers' not in raw or b'CpaRepository' not in raw:
+            return None
+        content = decode_source(raw)
+    except Exception as e:
+        # print(f"Error reading file {file_path}: {e}", file=sys.stderr)
+        return None
+    
+    declarations = scan_repository_declarations(strip_comments_cached(content))
+    class_name = declarations.define_name
+    if class_name is None:
+        return None
+    
+    types = find_repository_types(declarations, class_name)
+    if types is None:
+        return None
+    
+    return {
+        'class_name': class_name,
+        'type1': types[0],
+        'type2': types[1],
+        'is_templated': is_templated_class(declarations, class_name),
+    }
+
+
+# Facts the command line can print
+_CLI_OUTPUTS = ('class_name', 'type1', 'type2', 'is_templated', 'entity_type', 'methods')
+
+
+def main():
+    """
+    Main function to handle command line arguments.
+    
+    Prints the requested facts about one repository file, one per line, so a
+    caller that needs several of them starts a single process and the file is
+    read and stripped only once.
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Print the class name, types, entity type and/or methods of a repository file"
+    )
+    parser.add_argument(
+        "file_path",
+        help="Path to the repository file"
+    )
+    parser.add_argument(
+        "outputs",
+        nargs="*",
+        help="Facts to print, in order: class_name, type1, type2, is_templated, entity_type "
+             "and/or methods (default: class_name type1 type2 is_templated)"
+    )
+    
+    args = parser.parse_args()
+    
+    outputs = args.outputs or ['class_name', 'type1', 'type2', 'is_templated']
+    unknown = [output for output in outputs if output not in _CLI_OUTPUTS]
+    if unknown:
+        parser.error(f"unknown output(s): {', '.join(unknown)}")
+    
+    info = parse_repository_file(args.file_path)
+    if not info:
+        print(f"No repository class found in {args.file_path}", file=sys.stderr)
+        return 1
+    
+    for output in outputs:
+        if output == 'entity_type':
+            from extract_entity_type import extract_entity_type
+            print(extract_entity_type(args.file_path))
+        elif output == 'methods':
+            from extract_repository_methods import extract_repository_methods
+            print(' '.join(extract_repository_methods(args.file_path)))
+        else:
+            print(info[output])
+    
+    return 0
+
+
+# Export functions for other scripts to import
+__all__ = [
+    'RepositoryDeclarations',
+    'scan_repository_declarations',
+    'is_templated_class',
+    'find_repository_types',
+    'split_template_args',
+    'parse_repository_file',
+    'main'
+]
+
+
+if __name__ == "__main__":
+    exit(main())
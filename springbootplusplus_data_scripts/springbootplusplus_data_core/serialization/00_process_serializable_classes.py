@@ -7,6 +7,7 @@ Orchestrator script that processes all classes with @Entity annotation in client
 
 import os
 import sys
+import functools
 import importlib.util
 from pathlib import Path
 
@@ -29,10 +30,8 @@ parent_dir = os.path.dirname(script_dir)
 sys.path.insert(0, parent_dir)
 sys.path.insert(0, script_dir)
 
-try:
-    from get_client_files import get_client_files
-except ImportError:
-    get_client_files = None
+from get_client_files import get_client_files
+from file_cache import file_signature, content_digest, scripts_fingerprint, load_file_cache, save_file_cache
 
 # Import the serializer scripts
 sys.path.insert(0, script_dir)
@@ -45,47 +44,93 @@ spec_s3 = importlib.util.spec_from_file_location("S3_inject_serialization", os.p
 S3_inject_serialization = importlib.util.module_from_spec(spec_s3)
 spec_s3.loader.exec_module(S3_inject_serialization)
 
-# Import enum serialization script from serializationlib (it's shared)
-# Try to find serializationlib's serialization scripts
-S8_handle_enum_serialization = None
-try:
-    # Method 1: Try to find from library_dir if available
-    if 'library_dir' in globals():
-        potential_lib1_scripts = os.path.join(globals()['library_dir'], 'serializationlib', 'serializationlib_scripts', 'serializationlib_serializer', 'S8_handle_enum_serialization.py')
-        if os.path.exists(potential_lib1_scripts):
-            spec_s8 = importlib.util.spec_from_file_location("S8_handle_enum_serialization", potential_lib1_scripts)
-            S8_handle_enum_serialization = importlib.util.module_from_spec(spec_s8)
-            spec_s8.loader.exec_module(S8_handle_enum_serialization)
-    
-    # Method 2: Try to find from project_dir
-    if S8_handle_enum_serialization is None:
-        project_dir = None
-        if 'project_dir' in globals():
-            project_dir = globals()['project_dir']
-        elif 'PROJECT_DIR' in os.environ:
-            project_dir = os.environ['PROJECT_DIR']
-        elif 'CMAKE_PROJECT_DIR' in os.environ:
-            project_dir = os.environ['CMAKE_PROJECT_DIR']
-        
-        if project_dir:
-            potential_lib1_scripts = os.path.join(project_dir, 'serializationlib', 'serializationlib_scripts', 'serializationlib_serializer', 'S8_handle_enum_serialization.py')
+# Loaded once here rather than for every header file processed
+spec_s2 = importlib.util.spec_from_file_location("S2_extract_dto_fields", os.path.join(script_dir, "S2_extract_dto_fields.py"))
+S2_extract_dto_fields = importlib.util.module_from_spec(spec_s2)
+spec_s2.loader.exec_module(S2_extract_dto_fields)
+
+spec_s6 = importlib.util.spec_from_file_location("S6_discover_validation_macros", os.path.join(script_dir, "S6_discover_validation_macros.py"))
+S6_discover_validation_macros = importlib.util.module_from_spec(spec_s6)
+spec_s6.loader.exec_module(S6_discover_validation_macros)
+
+spec_s7 = importlib.util.spec_from_file_location("S7_extract_validation_fields", os.path.join(script_dir, "S7_extract_validation_fields.py"))
+S7_extract_validation_fields = importlib.util.module_from_spec(spec_s7)
+spec_s7.loader.exec_module(S7_extract_validation_fields)
+
+# Enum serialization script from serializationlib (it's shared). It is only located
+# and executed once a header with an annotation has to be processed (see _load_s8_module),
+# but looked for from the library_dir this script was loaded with, as before.
+_S8_LIBRARY_DIR = globals().get('library_dir')
+
+
+@functools.lru_cache(maxsize=1)
+def _find_s8_script():
+    """Path of serializationlib's S8_handle_enum_serialization.py, or None if not found."""
+    # Go up: serialization -> springbootplusplus_data_core -> springbootplusplus_data_scripts -> springbootplusplus_data -> project root
+    try:
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    except NameError:
+        project_root = None
+    
+    # Method 1: library_dir, method 2: relative path from this script
+    for root in (_S8_LIBRARY_DIR, project_root):
+        if root:
+            potential_lib1_scripts = os.path.join(root, 'serializationlib', 'serializationlib_scripts', 'serializationlib_serializer', 'S8_handle_enum_serialization.py')
             if os.path.exists(potential_lib1_scripts):
-                spec_s8 = importlib.util.spec_from_file_location("S8_handle_enum_serialization", potential_lib1_scripts)
-                S8_handle_enum_serialization = importlib.util.module_from_spec(spec_s8)
-                spec_s8.loader.exec_module(S8_handle_enum_serialization)
-    
-    # Method 3: Try relative path from current script
-    if S8_handle_enum_serialization is None:
-        current_file = os.path.abspath(__file__)
-        # Go up: serialization -> springbootplusplus_data_core -> springbootplusplus_data_scripts -> springbootplusplus_data -> project root
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file))))
-        potential_lib1_scripts = os.path.join(project_root, 'serializationlib', 'serializationlib_scripts', 'serializationlib_serializer', 'S8_handle_enum_serialization.py')
-        if os.path.exists(potential_lib1_scripts):
-            spec_s8 = importlib.util.spec_from_file_location("S8_handle_enum_serialization", potential_lib1_scripts)
-            S8_handle_enum_serialization = importlib.util.module_from_spec(spec_s8)
-            spec_s8.loader.exec_module(S8_handle_enum_serialization)
-except Exception:
-    S8_handle_enum_serialization = None
+                return potential_lib1_scripts
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_s8_module():
+    """The S8_handle_enum_serialization module, executed on first use, or None if unavailable."""
+    try:
+        s8_path = _find_s8_script()
+        if s8_path is None:
+            return None
+        spec_s8 = importlib.util.spec_from_file_location("S8_handle_enum_serialization", s8_path)
+        S8_handle_enum_serialization = importlib.util.module_from_spec(spec_s8)
+        spec_s8.loader.exec_module(S8_handle_enum_serialization)
+        return S8_handle_enum_serialization
+    except Exception:
+        return None
+
+# Fewest annotated headers worth forking worker processes for
+_MIN_PARALLEL_HEADERS = 16
+
+# Name of the file_cache of the headers with nothing to process
+_SETTLED_CACHE_NAME = "serializable_headers"
+
+
+def _settled_cache_scripts():
+    """Scripts deciding whether a header has anything to process (see file_cache)."""
+    scripts = [os.path.join(script_dir, "00_process_serializable_classes.py"),
+               os.path.join(script_dir, "S1_check_dto_macro.py")]
+    s8_path = _find_s8_script()
+    if s8_path is not None:
+        scripts.append(s8_path)
+    return scripts
+
+
+def _iter_subdirectories(directory):
+    """
+    Yield the DirEntry of each subdirectory of directory, following symlinks like Path.is_dir.
+    
+    One os.scandir pass: the entry types come with the directory listing, so plain
+    subdirectories cost no stat call. A missing or unreadable directory yields nothing.
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                yield entry
 
 
 def discover_all_libraries(project_dir):
@@ -96,48 +141,279 @@ def discover_all_libraries(project_dir):
     if not project_dir:
         return libraries
     
-    project_path = Path(project_dir).resolve()
+    project_path = os.path.realpath(project_dir)
     
-    build_deps = project_path / "build" / "_deps"
+    build_deps = os.path.join(project_path, "build", "_deps")
     
-    if build_deps.exists() and build_deps.is_dir():
-        for lib_dir in build_deps.iterdir():
-            if lib_dir.is_dir() and not lib_dir.name.startswith("."):
-                lib_name = lib_dir.name
-                
-                if lib_name.endswith("-src"):
-                    lib_root = lib_dir.resolve()
-                    lib_path_str = str(lib_root)
-                    if lib_path_str not in seen_libraries:
-                        seen_libraries.add(lib_path_str)
-                        libraries.append(lib_root)
-                elif (lib_dir / "src").exists() and (lib_dir / "src").is_dir():
-                    lib_root = lib_dir.resolve()
-                    lib_path_str = str(lib_root)
-                    if lib_path_str not in seen_libraries:
-                        seen_libraries.add(lib_path_str)
-                        libraries.append(lib_root)
-    
-    pio_libdeps = project_path / ".pio" / "libdeps"
-    
-    if pio_libdeps.exists() and pio_libdeps.is_dir():
-        for env_dir in pio_libdeps.iterdir():
-            if env_dir.is_dir():
-                for lib_dir in env_dir.iterdir():
-                    if lib_dir.is_dir():
-                        lib_root = lib_dir.resolve()
-                        lib_path_str = str(lib_root)
-                        
-                        if (lib_root / "src").exists() and (lib_root / "src").is_dir():
-                            if lib_path_str not in seen_libraries:
-                                seen_libraries.add(lib_path_str)
-                                libraries.append(lib_root)
+    for lib_dir in _iter_subdirectories(build_deps):
+        if lib_dir.name.startswith("."):
+            continue
+        
+        # A -src directory is a library root; other directories are if they hold a src folder
+        # (os.path.isdir is a single stat, where exists() + is_dir() took two)
+        if lib_dir.name.endswith("-src") or os.path.isdir(os.path.join(lib_dir.path, "src")):
+            lib_path_str = os.path.realpath(lib_dir.path)
+            if lib_path_str not in seen_libraries:
+                seen_libraries.add(lib_path_str)
+                libraries.append(Path(lib_path_str))
+    
+    pio_libdeps = os.path.join(project_path, ".pio", "libdeps")
+    
+    for env_dir in _iter_subdirectories(pio_libdeps):
+        for lib_dir in _iter_subdirectories(env_dir.path):
+            lib_path_str = os.path.realpath(lib_dir.path)
+            
+            if lib_path_str not in seen_libraries and os.path.isdir(os.path.join(lib_path_str, "src")):
+                seen_libraries.add(lib_path_str)
+                libraries.append(Path(lib_path_str))
     
     return libraries
 
 
-def process_all_serializable_classes(dry_run=False, serializable_macro=None):
-    """Process all client files that contain classes with @Entity annotation."""
+def _iter_header_files(project_dir, libraries):
+    """
+    Yield the header files of the project, then those of each library, one listing at a time.
+    
+    The files are looked at as they come instead of being gathered into one list first.
+    A directory that cannot be listed is skipped.
+    """
+    try:
+        yield from get_client_files(project_dir, file_extensions=['.h', '.hpp'])
+    except Exception as e:
+        pass
+    
+    for lib_dir in libraries:
+        try:
+            lib_files = get_client_files(str(lib_dir), skip_exclusions=True, file_extensions=['.h', '.hpp'])
+        except Exception as e:
+            continue
+        yield from lib_files
+
+
+def _read_header(file_path):
+    """Read a header as bytes, or None if it cannot be read."""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _process_header(file_path, serializable_macro, dry_run, get_validation_macros, raw=None):
+    """
+    Process the annotated enum and class of one header file.
+    
+    Args:
+        file_path: Path to the header file
+        serializable_macro: Annotation identifier (_Entity -> @Entity, Serializable -> @Serializable)
+        dry_run: If True, don't modify the file
+        get_validation_macros: Function returning the validation macro definitions
+        raw: Content of the file as bytes if the caller already read it
+        
+    Returns:
+        (processed, settled): the number of enums and classes processed in the file, and
+        whether it holds no annotated enum or class at all (so nothing to do while unchanged)
+    """
+    if raw is None:
+        raw = _read_header(file_path)
+        if raw is None:
+            return 0, False
+    
+    processed_count = 0
+    
+    # Set when the enum handling below rewrites the file (raw is stale then)
+    file_changed = False
+    enum_found = False
+    
+    # First, check if file has enum with @Serializable annotation
+    S8_handle_enum_serialization = _load_s8_module()
+    if S8_handle_enum_serialization:
+        enum_info = S8_handle_enum_serialization.check_enum_annotation(file_path, serializable_macro)
+        if enum_info and enum_info.get('has_enum'):
+            enum_found = True
+            # Process enum serialization
+            if not dry_run:
+                file_changed = True
+                enum_name = enum_info['enum_name']
+                enum_line = enum_info['enum_line']
+                annotation_line = enum_info['annotation_line']
+                
+                # Extract enum values
+                enum_values = S8_handle_enum_serialization.extract_enum_values(file_path, enum_name, enum_line)
+                
+                if enum_values:
+                    # Generate code
+                    code = S8_handle_enum_serialization.generate_enum_serialization_code(enum_name, enum_values)
+                    
+                    # Add necessary includes
+                    S8_handle_enum_serialization.add_include_if_needed(file_path, "<SerializationUtility.h>")
+                    S8_handle_enum_serialization.add_include_if_needed(file_path, "<algorithm>")
+                    S8_handle_enum_serialization.add_include_if_needed(file_path, "<cctype>")
+                    
+                    # Inject code
+                    success = S8_handle_enum_serialization.inject_enum_code(file_path, code, dry_run=False)
+                    if success:
+                        # Mark annotation as processed
+                        S8_handle_enum_serialization.mark_enum_annotation_processed(file_path, annotation_line, dry_run=False)
+                        processed_count += 1
+    
+    # Check if file has @Entity/@Serializable annotation (for classes)
+    if file_changed:
+        raw = _read_header(file_path)
+    content = None
+    if raw is not None:
+        try:
+            # Same text as open(file_path, 'r', encoding='utf-8').read()
+            content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        except UnicodeDecodeError:
+            pass
+    
+    # S1 searches the content as a whole; it is split into lines only for the fields of a DTO
+    if content is not None:
+        dto_info = S1_check_dto_macro.check_dto_macro(file_path, serializable_macro, content)
+    else:
+        dto_info = S1_check_dto_macro.check_dto_macro(file_path, serializable_macro)
+    
+    if not dto_info or not dto_info.get('has_dto'):
+        # Settled unless an annotated enum was found
+        return processed_count, not enum_found
+    
+    class_name = dto_info['class_name']
+    
+    if content is not None:
+        fields = S2_extract_dto_fields.extract_all_fields(file_path, class_name, content)
+    else:
+        fields = S2_extract_dto_fields.extract_all_fields(file_path, class_name)
+    
+    if not fields:
+        pass
+    
+    optional_fields = [field for field in fields if S3_inject_serialization.is_optional_type(field['type'].strip())]
+    non_optional_fields = [field for field in fields if not S3_inject_serialization.is_optional_type(field['type'].strip())]
+    
+    validation_fields_by_macro = S7_extract_validation_fields.extract_validation_fields(
+        file_path, class_name, get_validation_macros()
+    )
+    
+    # Extract @Id fields for primary key methods
+    try:
+        from extract_id_fields import extract_id_fields
+        id_fields = extract_id_fields(file_path, class_name)
+    except Exception:
+        id_fields = []
+    
+    methods_code = S3_inject_serialization.generate_serialization_methods(class_name, fields, validation_fields_by_macro, id_fields)
+    
+    if not dry_run:
+        if optional_fields:
+            S3_inject_serialization.add_include_if_needed(file_path, "<optional>")
+    
+    success = S3_inject_serialization.inject_methods_into_class(file_path, class_name, methods_code, dry_run=dry_run)
+    
+    if success:
+        if not dry_run:
+            S3_inject_serialization.comment_dto_macro(file_path, dry_run=False, serializable_macro=serializable_macro)
+        processed_count += 1
+    return processed_count, False
+
+
+def _can_fork():
+    """Whether worker processes can be forked (they inherit the loaded modules and state)."""
+    import multiprocessing
+    return sys.platform != 'win32' and 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _run_worker(process, headers, connection):
+    """
+    Worker process body: process the headers in order and send back the count
+    and the settled paths (or the error).
+    """
+    try:
+        processed_count = 0
+        settled_paths = []
+        for file_path, raw in headers:
+            processed, settled = process(file_path, raw=raw)
+            processed_count += processed
+            if settled:
+                settled_paths.append(file_path)
+        connection.send((True, (processed_count, settled_paths)))
+    except BaseException:
+        import traceback
+        connection.send((False, traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def _process_in_workers(process, headers, workers):
+    """
+    Run process(file_path, raw=raw) over the headers in forked worker processes.
+    
+    Every header is transformed independently, so the files are shared out between
+    the workers; the occurrences of a path listed more than once all go to the same
+    worker, in their original order, so a file is never modified by two processes.
+    The workers are forked rather than handed the work through a pool: this script is
+    executed from its file path, so its functions cannot be pickled by name.
+    
+    Args:
+        process: Function of (file_path, raw=...) processing one header, returning (processed count, settled)
+        headers: (file_path, raw content or None) of the headers to process
+        workers: Number of worker processes
+        
+    Returns:
+        (processed, settled_paths): the total number of enums and classes processed,
+        and the paths of the headers that had nothing to process
+    
+    Raises:
+        RuntimeError: If a worker failed (with the worker's traceback)
+    """
+    import multiprocessing
+    
+    workers = min(workers, len(headers))
+    slots = {}
+    shares = [[] for _ in range(workers)]
+    for header in headers:
+        shares[slots.setdefault(header[0], len(slots) % workers)].append(header)
+    
+    context = multiprocessing.get_context('fork')
+    running = []
+    for share in shares:
+        reader, writer = context.Pipe(duplex=False)
+        worker = context.Process(target=_run_worker, args=(process, share, writer))
+        worker.start()
+        writer.close()
+        running.append((worker, reader))
+    
+    processed_count = 0
+    settled_paths = []
+    errors = []
+    for worker, reader in running:
+        try:
+            ok, result = reader.recv()
+        except EOFError:
+            ok, result = False, f"worker exited with code {worker.exitcode}"
+        reader.close()
+        worker.join()
+        if ok:
+            processed_count += result[0]
+            settled_paths.extend(result[1])
+        else:
+            errors.append(result)
+    
+    if errors:
+        raise RuntimeError("Processing headers failed in a worker process:\n" + "\n".join(errors))
+    return processed_count, settled_paths
+
+
+def process_all_serializable_classes(dry_run=False, serializable_macro=None, workers=None, project_dir=None):
+    """
+    Process all client files that contain classes with @Entity annotation.
+    
+    project_dir defaults to the project_dir global set by the build script, then to
+    the PROJECT_DIR or CMAKE_PROJECT_DIR environment variable.
+    
+    With many annotated headers, the files are processed in parallel by up to
+    workers forked processes (defaults to the number of CPUs; 1 processes them here).
+    """
     if serializable_macro is None:
         if 'serializable_macro' in globals():
             serializable_macro = globals()['serializable_macro']
@@ -146,150 +422,97 @@ def process_all_serializable_classes(dry_run=False, serializable_macro=None):
         else:
             serializable_macro = "_Entity"
     
-    project_dir = None
-    # Try to get from the module that contains this function
-    import sys
-    # Get the module from sys.modules
-    for name, mod in sys.modules.items():
-        if hasattr(mod, 'process_all_serializable_classes') and mod.process_all_serializable_classes == process_all_serializable_classes:
-            # Try as attribute first
-            if hasattr(mod, 'project_dir') and mod.project_dir is not None:
-                project_dir = mod.project_dir
-                break
-            # Then try __dict__
-            if hasattr(mod, '__dict__') and 'project_dir' in mod.__dict__ and mod.__dict__['project_dir'] is not None:
-                project_dir = mod.__dict__['project_dir']
-                break
-    
-    # Try globals() - but check if it's actually set (not None)
-    if not project_dir:
-        if 'project_dir' in globals() and globals()['project_dir'] is not None:
-            project_dir = globals()['project_dir']
-    
-    # Try environment variables
+    # An explicit argument first, then the project_dir the build script injects into
+    # this module's globals, then the environment
     if not project_dir:
-        if 'PROJECT_DIR' in os.environ:
-            project_dir = os.environ['PROJECT_DIR']
-        elif 'CMAKE_PROJECT_DIR' in os.environ:
-            project_dir = os.environ['CMAKE_PROJECT_DIR']
+        project_dir = (globals().get('project_dir')
+                       or os.environ.get('PROJECT_DIR')
+                       or os.environ.get('CMAKE_PROJECT_DIR'))
     
     if not project_dir:
         return 0
     
-    if get_client_files is None:
-        return 0
-    
     all_libraries = discover_all_libraries(project_dir)
     
-    header_files = []
-    
-    try:
-        project_files = get_client_files(project_dir, file_extensions=['.h', '.hpp'])
-        header_files.extend(project_files)
-    except Exception as e:
-        pass
-    
-    for lib_dir in all_libraries:
-        try:
-            lib_files = get_client_files(str(lib_dir), skip_exclusions=True, file_extensions=['.h', '.hpp'])
-            header_files.extend(lib_files)
-        except Exception as e:
-            pass
+    # A file can only hold an annotated class or enum if it mentions one of these
+    annotation_markers = (serializable_macro.encode('utf-8'), b'@Serializable', b'@Entity')
     
-    if not header_files:
-        return 0
+    # The macro definitions do not depend on the file: discover them once,
+    # when the first class needs them
+    get_validation_macros = functools.lru_cache(maxsize=None)(
+        lambda: S6_discover_validation_macros.find_validation_macro_definitions(None)
+    )
     
-    processed_count = 0
+    # Headers the previous build found nothing to process in are skipped while unchanged
+    # (the outcome also depends on this script, S1, S8 and the annotation name). They are
+    # recorded as [mtime_ns, size, content digest]: a header rewritten with the same
+    # content is recognized from its bytes, without running S1 and S8 on it again
+    cache_fingerprint = scripts_fingerprint(_settled_cache_scripts(), serializable_macro)
+    settled_cache = load_file_cache(project_dir, _SETTLED_CACHE_NAME, cache_fingerprint)
+    settled = {}
     
-    for file_path in header_files:
-        if not os.path.exists(file_path):
+    # Read the headers once: the bytes rule out most of them without decoding,
+    # and are handed on to the processing of the others
+    signatures = {}
+    candidates = []
+    seen = set()
+    listed = False
+    for file_path in _iter_header_files(project_dir, all_libraries):
+        listed = True
+        signature = file_signature(file_path)
+        if signature is None:
             continue
-        
-        # First, check if file has enum with @Serializable annotation
-        if S8_handle_enum_serialization:
-            enum_info = S8_handle_enum_serialization.check_enum_annotation(file_path, serializable_macro)
-            if enum_info and enum_info.get('has_enum'):
-                # Process enum serialization
-                if not dry_run:
-                    enum_name = enum_info['enum_name']
-                    enum_line = enum_info['enum_line']
-                    annotation_line = enum_info['annotation_line']
-                    
-                    # Extract enum values
-                    enum_values = S8_handle_enum_serialization.extract_enum_values(file_path, enum_name, enum_line)
-                    
-                    if enum_values:
-                        # Generate code
-                        code = S8_handle_enum_serialization.generate_enum_serialization_code(enum_name, enum_values)
-                        
-                        # Add necessary includes
-                        S8_handle_enum_serialization.add_include_if_needed(file_path, "<SerializationUtility.h>")
-                        S8_handle_enum_serialization.add_include_if_needed(file_path, "<algorithm>")
-                        S8_handle_enum_serialization.add_include_if_needed(file_path, "<cctype>")
-                        
-                        # Inject code
-                        success = S8_handle_enum_serialization.inject_enum_code(file_path, code, dry_run=False)
-                        if success:
-                            # Mark annotation as processed
-                            S8_handle_enum_serialization.mark_enum_annotation_processed(file_path, annotation_line, dry_run=False)
-                            processed_count += 1
-        
-        # Check if file has @Entity/@Serializable annotation (for classes)
-        dto_info = S1_check_dto_macro.check_dto_macro(file_path, serializable_macro)
-        
-        if not dto_info or not dto_info.get('has_dto'):
+        entry = settled_cache.get(file_path)
+        if isinstance(entry, list) and entry[:2] == signature:
+            settled[file_path] = entry
             continue
         
-        class_name = dto_info['class_name']
-        
-        import S2_extract_dto_fields
-        spec_s2 = importlib.util.spec_from_file_location("S2_extract_dto_fields", os.path.join(script_dir, "S2_extract_dto_fields.py"))
-        S2_extract_dto_fields = importlib.util.module_from_spec(spec_s2)
-        spec_s2.loader.exec_module(S2_extract_dto_fields)
-        
-        fields = S2_extract_dto_fields.extract_all_fields(file_path, class_name)
-        
-        if not fields:
-            pass
-        
-        optional_fields = [field for field in fields if S3_inject_serialization.is_optional_type(field['type'].strip())]
-        non_optional_fields = [field for field in fields if not S3_inject_serialization.is_optional_type(field['type'].strip())]
-        
-        import S6_discover_validation_macros
-        spec_s6 = importlib.util.spec_from_file_location("S6_discover_validation_macros", os.path.join(script_dir, "S6_discover_validation_macros.py"))
-        S6_discover_validation_macros = importlib.util.module_from_spec(spec_s6)
-        spec_s6.loader.exec_module(S6_discover_validation_macros)
-        
-        validation_macros = S6_discover_validation_macros.find_validation_macro_definitions(None)
-        
-        import S7_extract_validation_fields
-        spec_s7 = importlib.util.spec_from_file_location("S7_extract_validation_fields", os.path.join(script_dir, "S7_extract_validation_fields.py"))
-        S7_extract_validation_fields = importlib.util.module_from_spec(spec_s7)
-        spec_s7.loader.exec_module(S7_extract_validation_fields)
-        
-        validation_fields_by_macro = S7_extract_validation_fields.extract_validation_fields(
-            file_path, class_name, validation_macros
-        )
-        
-        # Extract @Id fields for primary key methods
-        try:
-            from extract_id_fields import extract_id_fields
-            id_fields = extract_id_fields(file_path, class_name)
-        except Exception:
-            id_fields = []
-        
-        methods_code = S3_inject_serialization.generate_serialization_methods(class_name, fields, validation_fields_by_macro, id_fields)
-        
-        if not dry_run:
-            if optional_fields:
-                S3_inject_serialization.add_include_if_needed(file_path, "<optional>")
-        
-        success = S3_inject_serialization.inject_methods_into_class(file_path, class_name, methods_code, dry_run=dry_run)
+        raw = _read_header(file_path)
+        if raw is None:
+            continue
+        signature.append(content_digest(raw))
+        if isinstance(entry, list) and entry[2:] == signature[2:]:
+            # Rewritten with the same content: still nothing to process
+            settled[file_path] = signature
+            continue
+        if not any(marker in raw for marker in annotation_markers):
+            settled[file_path] = signature
+            continue
         
-        if success:
-            if not dry_run:
-                S3_inject_serialization.comment_dto_macro(file_path, dry_run=False, serializable_macro=serializable_macro)
-            processed_count += 1
+        signatures[file_path] = signature
+        # A path listed again is read again when its turn comes: processing it the
+        # first time may have changed it
+        candidates.append((file_path, None if file_path in seen else raw))
+        seen.add(file_path)
+    
+    if not listed:
+        return 0
+    
+    process = functools.partial(_process_header, serializable_macro=serializable_macro,
+                                dry_run=dry_run, get_validation_macros=get_validation_macros)
+    
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(candidates) >= _MIN_PARALLEL_HEADERS and _can_fork():
+        # Load S8 and discover the validation macros before forking, so the workers inherit them
+        _load_s8_module()
+        get_validation_macros()
+        processed_count, settled_paths = _process_in_workers(process, candidates, workers)
+    else:
+        processed_count = 0
+        settled_paths = []
+        for file_path, raw in candidates:
+            processed, is_settled = process(file_path, raw=raw)
+            processed_count += processed
+            if is_settled:
+                settled_paths.append(file_path)
+    
+    # Recorded with the signature taken before reading, so a header changed since
+    # is looked at again next time
+    for file_path in settled_paths:
+        settled[file_path] = signatures[file_path]
+    if not dry_run:
+        save_file_cache(project_dir, _SETTLED_CACHE_NAME, cache_fingerprint, settled)
+    
     return processed_count
 
 
@@ -7,95 +7,173 @@ This script checks if a C++ class has the @Entity annotation above it.
 
 import re
 import argparse
+import functools
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, Iterator, Pattern, Tuple
 
+# Precompiled patterns (compiled once at import instead of on every line)
+# Class declaration: class Name followed by : or {
+_CLASS_RE = re.compile(r'class\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:[:{])')
+# Line the look-ahead for the class continues past: one starting with a known
+# annotation/macro, or macro-like (an uppercase identifier alone or followed by an
+# opening parenthesis)
+_CONTINUE_RE = re.compile(r'^(?:COMPONENT|SCOPE|VALIDATE|Dto|[A-Z][A-Za-z0-9_]*\s*(?:\(|$))')
 
-def check_dto_annotation(file_path: str, serializable_annotation: str = "_Entity") -> Optional[Dict[str, any]]:
-    """
-    Check if a C++ file contains a class with the @Entity or @Serializable annotation above it.
-    
-    Args:
-        file_path: Path to the C++ file
-        serializable_annotation: Name of the annotation identifier (Serializable -> @Serializable, _Entity -> @Entity)
-        
-    Returns:
-        Dictionary with 'class_name', 'has_dto', 'line_number' if found, None otherwise
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-    except FileNotFoundError:
-        pass
-    except Exception as e:
-        pass
-    
+
+def _annotation_name(serializable_annotation: str) -> str:
+    """Annotation of an annotation identifier (_Entity -> @Entity, anything else -> @Serializable)."""
     # Determine annotation name based on annotation identifier
     if serializable_annotation == "_Entity":
-        annotation_name = "@Entity"
+        return "@Entity"
     elif serializable_annotation == "Serializable":
-        annotation_name = "@Serializable"
+        return "@Serializable"
     else:
         # Default to @Serializable for backward compatibility
-        annotation_name = "@Serializable"
+        return "@Serializable"
+
+
+@functools.lru_cache(maxsize=8)
+def _annotation_patterns(annotation_name: str) -> Tuple[Pattern, Pattern]:
+    """
+    Compiled patterns of an annotation (e.g. @Entity), memoized per annotation name.
     
-    # Pattern to match /* @Entity */ or /*@Entity*/ or /* @Serializable */ or /*@Serializable*/ annotation (ignoring whitespace)
-    # Also check for already processed /*--@Entity--*/ or /*--@Serializable--*/ pattern
-    annotation_pattern = rf'/\*\s*{re.escape(annotation_name)}\s*\*/'
-    processed_pattern = rf'/\*--\s*{re.escape(annotation_name)}\s*--\*/'
+    Returns:
+        (annotation, processed): patterns matching /* @Entity */ and /*--@Entity--*/
+        (or /*@Entity*/ and /*-- @Entity --*/, ignoring whitespace)
+    """
+    return (re.compile(rf'/\*\s*{re.escape(annotation_name)}\s*\*/'),
+            re.compile(rf'/\*--\s*{re.escape(annotation_name)}\s*--\*/'))
+
+
+def _is_annotation_line(stripped_line: str, annotation_name: str, annotation_pattern: Pattern, processed_pattern: Pattern) -> bool:
+    """Whether a stripped line holds the (unprocessed) annotation, outside of other comments."""
+    # Both patterns need the annotation name: most lines are ruled out by a substring test
+    if annotation_name not in stripped_line:
+        return False
     
-    # Pattern to match class declarations
-    class_pattern = r'class\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:[:{])'
+    # Check if line is already processed (/*--@Entity--*/ or /*--@Serializable--*/)
+    if processed_pattern.search(stripped_line):
+        return False
     
-    for line_num, line in enumerate(lines, 1):
-        stripped_line = line.strip()
-        
-        # Check if line is already processed (/*--@Entity--*/ or /*--@Serializable--*/)
-        if re.search(processed_pattern, stripped_line):
-            continue
+    # Skip other comments that aren't @Entity/@Serializable annotations
+    # But allow /* @Entity */ or /* @Serializable */ annotations to be processed
+    if stripped_line.startswith('/*') and not annotation_pattern.search(stripped_line):
+        return False
+    # Skip single-line comments
+    if stripped_line.startswith('//'):
+        return False
+    
+    # Check for annotation (/* @Entity */ or /*@Entity*/ or /* @Serializable */ or /*@Serializable*/)
+    return annotation_pattern.search(stripped_line) is not None
+
+
+def _class_after_annotation(numbered_lines: Iterable[Tuple[int, str]], line_num: int, annotation_name: str,
+                            annotation_pattern: Pattern) -> Optional[Dict[str, any]]:
+    """
+    Look ahead for the class declaration following an annotation.
+    
+    Args:
+        numbered_lines: (line number, stripped line) of the annotation line and the 10 lines after it
+        line_num: Line number of the annotation
+        annotation_name: The annotation (@Entity or @Serializable)
+        annotation_pattern: Compiled pattern of the annotation (see _annotation_patterns)
         
-        # Skip other comments that aren't @Entity/@Serializable annotations
+    Returns:
+        The check_dto_annotation result if a class is declared there, None otherwise
+    """
+    for i, next_line in numbered_lines:
+        # Skip other comments that aren't annotations
         # But allow /* @Entity */ or /* @Serializable */ annotations to be processed
-        if stripped_line.startswith('/*') and not re.search(annotation_pattern, stripped_line):
+        has_annotation = annotation_name in next_line and annotation_pattern.search(next_line)
+        if next_line.startswith('/*') and not has_annotation:
             continue
         # Skip single-line comments
-        if stripped_line.startswith('//'):
+        if next_line.startswith('//'):
             continue
         
-        # Check for annotation (/* @Entity */ or /*@Entity*/ or /* @Serializable */ or /*@Serializable*/)
-        annotation_match = re.search(annotation_pattern, stripped_line)
-        if annotation_match:
-            # Look ahead for class declaration (within next 10 lines)
-            for i in range(line_num, min(line_num + 11, len(lines) + 1)):
-                if i <= len(lines):
-                    next_line = lines[i - 1].strip()
-                    
-                    # Skip other comments that aren't annotations
-                    # But allow /* @Entity */ or /* @Serializable */ annotations to be processed
-                    if next_line.startswith('/*') and not re.search(annotation_pattern, next_line):
-                        continue
-                    # Skip single-line comments
-                    if next_line.startswith('//'):
-                        continue
-                    
-                    # Check for class declaration
-                    class_match = re.search(class_pattern, next_line)
-                    if class_match:
-                        class_name = class_match.group(1)
-                        return {
-                            'class_name': class_name,
-                            'has_dto': True,
-                            'dto_line': line_num,
-                            'class_line': i
-                        }
-                    
-                    # Stop if we hit something that's not an annotation or class
-                    # Check if it starts with known annotations/macros
-                    known_annotations = ('COMPONENT', 'SCOPE', 'VALIDATE', 'Dto')
-                    if next_line and not (next_line.startswith(known_annotations) or 
-                                         re.match(r'^[A-Z][A-Za-z0-9_]*\s*(?:\(|$)', next_line) or
-                                         re.search(annotation_pattern, next_line)):
-                        break
+        # Check for class declaration
+        class_match = 'class' in next_line and _CLASS_RE.search(next_line)
+        if class_match:
+            class_name = class_match.group(1)
+            return {
+                'class_name': class_name,
+                'has_dto': True,
+                'dto_line': line_num,
+                'class_line': i
+            }
+        
+        # Stop if we hit something that's not an annotation or class
+        # Check if it starts with known annotations/macros
+        if next_line and not (_CONTINUE_RE.match(next_line) or has_annotation):
+            break
+    
+    return None
+
+
+def _iter_text_lines(content: str, start: int, line_num: int, count: int) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line number, stripped line) for up to count lines of content, from the line
+    starting at offset start (numbered line_num), as content.split('\\n') would give them.
+    """
+    for i in range(line_num, line_num + count):
+        end = content.find('\n', start)
+        if end == -1:
+            yield i, content[start:].strip()
+            return
+        yield i, content[start:end].strip()
+        start = end + 1
+
+
+def check_dto_annotation(file_path: str, serializable_annotation: str = "_Entity", content: Optional[str] = None) -> Optional[Dict[str, any]]:
+    """
+    Check if a C++ file contains a class with the @Entity or @Serializable annotation above it.
+    
+    The text is searched as a whole for the annotation name; only the lines holding it,
+    and the look-ahead after an annotation, are looked at one by one.
+    
+    Args:
+        file_path: Path to the C++ file
+        serializable_annotation: Name of the annotation identifier (Serializable -> @Serializable, _Entity -> @Entity)
+        content: Content of the file if the caller already read it (the file is not read again)
+        
+    Returns:
+        Dictionary with 'class_name', 'has_dto', 'line_number' if found, None otherwise
+    """
+    if content is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                content = file.read()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            pass
+    
+    annotation_name = _annotation_name(serializable_annotation)
+    annotation_pattern, processed_pattern = _annotation_patterns(annotation_name)
+    
+    # Jump from one occurrence of the annotation name to the next (without it anywhere
+    # in the file, no line can hold the annotation), counting lines on the way
+    line_num = 1
+    counted = 0
+    pos = content.find(annotation_name)
+    while pos != -1:
+        start = content.rfind('\n', 0, pos) + 1
+        end = content.find('\n', pos)
+        if end == -1:
+            end = len(content)
+        line_num += content.count('\n', counted, start)
+        counted = start
+        
+        if _is_annotation_line(content[start:end].strip(), annotation_name, annotation_pattern, processed_pattern):
+            # Look ahead for class declaration (within next 10 lines), starting
+            # with the annotation line itself
+            result = _class_after_annotation(_iter_text_lines(content, start, line_num, 11),
+                                             line_num, annotation_name, annotation_pattern)
+            if result:
+                return result
+        
+        # The rest of this line was checked as a whole: continue on the next one
+        pos = content.find(annotation_name, end)
     
     return {
         'has_dto': False
@@ -142,12 +220,12 @@ def main():
 
 
 # Backward compatibility alias
-def check_dto_macro(file_path: str, serializable_macro: str = "_Entity") -> Optional[Dict[str, any]]:
+def check_dto_macro(file_path: str, serializable_macro: str = "_Entity", content: Optional[str] = None) -> Optional[Dict[str, any]]:
     """
     Deprecated: Use check_dto_annotation instead.
     Check if a C++ file contains a class with the @Entity or @Serializable annotation above it.
     """
-    return check_dto_annotation(file_path, serializable_macro)
+    return check_dto_annotation(file_path, serializable_macro, content)
 
 
 # Export functions for other scripts to import
@@ -7,49 +7,59 @@ This script extracts all member variables from a class with @Entity annotation.
 
 import re
 import argparse
+import functools
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Pattern
 
+# Precompiled patterns (compiled once at import instead of on every line)
+# Access specifier (C++ keywords are lowercase)
+_ACCESS_RE = re.compile(r'^\s*(public|private|protected)\s*:')
+# Field pattern: matches "int a;" or "StdString name;". The type is the shortest one
+# that works, so it never ends with whitespace; saying so lets the type only end on a
+# non-space character, instead of being retried at every space of a long run of them
+_FIELD_RE = re.compile(r'^\s*([A-Za-z_](?:[A-Za-z0-9_<>*&,\s]*?[A-Za-z0-9_<>*&,])?)\s+([A-Za-z_][A-Za-z0-9_]*)\s*[;=]')
 
-def find_class_boundaries(file_path: str, class_name: str) -> Optional[tuple]:
+
+@functools.lru_cache(maxsize=256)
+def _class_pattern(class_name: str) -> Pattern:
+    """Compiled pattern matching the declaration of class_name."""
+    return re.compile(rf'class\s+{re.escape(class_name)}')
+
+
+def _scan_class(stripped_lines: List[str], class_name: str) -> Optional[tuple]:
     """
-    Find the start and end line numbers of a class definition.
+    Find the start and end line numbers of a class definition in the lines of a file.
     
     Args:
-        file_path: Path to the C++ file
+        stripped_lines: Lines of the C++ file, stripped of surrounding whitespace
         class_name: Name of the class to find
         
     Returns:
         Tuple of (start_line, end_line) or None if not found
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-    except Exception as e:
-        pass
-    
     class_start = None
     brace_count = 0
     in_class = False
     
     # Pattern to match class declaration
-    class_pattern = rf'class\s+{re.escape(class_name)}'
+    class_pattern = _class_pattern(class_name)
     
-    for line_num, line in enumerate(lines, 1):
-        stripped_line = line.strip()
-        
+    for line_num, stripped_line in enumerate(stripped_lines, 1):
         # Skip commented lines
-        if stripped_line.startswith('//') or stripped_line.startswith('/*') or stripped_line.startswith('*'):
+        if stripped_line.startswith(('//', '/*', '*')):
             continue
         
         # Check for class declaration
-        if not in_class and re.search(class_pattern, stripped_line):
+        if not in_class and class_pattern.search(stripped_line):
             class_start = line_num
             in_class = True
             # Initialize brace count from this line
             brace_count = stripped_line.count('{') - stripped_line.count('}')
         elif in_class:
-            # Count braces for subsequent lines
+            # Count braces for subsequent lines (most have none: two substring tests
+            # rule those out; the count cannot reach 0 on them either)
+            if '{' not in stripped_line and '}' not in stripped_line:
+                continue
             brace_count += stripped_line.count('{')
             brace_count -= stripped_line.count('}')
         
@@ -61,64 +71,110 @@ def find_class_boundaries(file_path: str, class_name: str) -> Optional[tuple]:
     return None
 
 
-def extract_all_fields(file_path: str, class_name: str) -> List[Dict[str, str]]:
+def _read_content(file_path: str, content: Optional[str]) -> Optional[str]:
+    """Content of the file: content itself if the caller already read it, else read as UTF-8 text."""
+    if content is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                content = file.read()
+        except Exception as e:
+            pass
+    return content
+
+
+def find_class_boundaries(file_path: str, class_name: str, content: Optional[str] = None) -> Optional[tuple]:
+    """
+    Find the start and end line numbers of a class definition.
+    
+    Args:
+        file_path: Path to the C++ file
+        class_name: Name of the class to find
+        content: Content of the file if the caller already read it (the file is not read again)
+        
+    Returns:
+        Tuple of (start_line, end_line) or None if not found
+    """
+    content = _read_content(file_path, content)
+    
+    # The declaration needs the class name: without it anywhere, there is nothing to split
+    if class_name not in content:
+        return None
+    
+    return _scan_class([line.strip() for line in content.split('\n')], class_name)
+
+
+def extract_all_fields(file_path: str, class_name: str, content: Optional[str] = None) -> List[Dict[str, str]]:
     """
     Extract all member variables (public, private, protected) from a class.
     
     Args:
         file_path: Path to the C++ file
         class_name: Name of the class
+        content: Content of the file if the caller already read it (the file is not read again)
+        
+    Returns:
+        List of dictionaries with 'type' and 'name' keys
+    """
+    # Read the file once: the class boundaries and the fields come from the same lines
+    content = _read_content(file_path, content)
+    
+    # The declaration needs the class name: without it anywhere, there are no fields
+    if class_name not in content:
+        return []
+    
+    return extract_fields_from_lines([line.strip() for line in content.split('\n')], class_name)
+
+
+def extract_fields_from_lines(stripped_lines: List[str], class_name: str) -> List[Dict[str, str]]:
+    """
+    extract_all_fields on the lines of a file, each already stripped.
+    
+    Args:
+        stripped_lines: Lines of the C++ file, stripped of surrounding whitespace
+        class_name: Name of the class
         
     Returns:
         List of dictionaries with 'type' and 'name' keys
     """
-    boundaries = find_class_boundaries(file_path, class_name)
+    boundaries = _scan_class(stripped_lines, class_name)
     if not boundaries:
         return []
     
     start_line, end_line = boundaries
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-    except Exception as e:
-        pass
-    
-    class_lines = lines[start_line - 1:end_line]
+    class_lines = stripped_lines[start_line - 1:end_line]
     
     fields = []
     current_access = None
     
-    # Patterns
-    access_pattern = r'^\s*(public|private|protected)\s*:'
-    # Field pattern: matches "int a;" or "StdString name;"
-    field_pattern = r'^\s*([A-Za-z_][A-Za-z0-9_<>*&,\s]*?)\s+([A-Za-z_][A-Za-z0-9_]*)\s*[;=]'
-    
-    for line in class_lines:
-        stripped = line.strip()
-        
+    for stripped in class_lines:
         # Skip comments
-        if stripped.startswith('//') or stripped.startswith('/*'):
+        if stripped.startswith(('//', '/*')):
             continue
         
         # Skip empty lines
         if not stripped:
             continue
         
-        # Check for access specifier (case insensitive)
-        access_match = re.search(access_pattern, stripped, re.IGNORECASE)
+        # Check for access specifier (only lines with a colon can hold one)
+        access_match = ':' in stripped and _ACCESS_RE.search(stripped)
         if access_match:
-            current_access = access_match.group(1).lower()
+            current_access = access_match.group(1)
+            continue
+        
+        # Skip if it looks like a method declaration (has parentheses), and lines
+        # without the ; or = a field ends on: no need to run the field pattern on them
+        if '(' in stripped or ')' in stripped or (';' not in stripped and '=' not in stripped):
             continue
         
         # Process all members (public, private, protected) - no access restriction
         # Check for member variable
-        field_match = re.search(field_pattern, stripped)
+        field_match = _FIELD_RE.search(stripped)
         if field_match:
             field_type = field_match.group(1).strip()
             field_name = field_match.group(2).strip()
-            # Skip if it looks like a method declaration (has parentheses) or is a keyword
-            if '(' not in stripped and ')' not in stripped and field_name not in ['public', 'private', 'protected']:
+            # Skip keywords
+            if field_name not in ['public', 'private', 'protected']:
                 fields.append({
                     'type': field_type,
                     'name': field_name
@@ -156,6 +212,7 @@ extract_public_fields = extract_all_fields
 __all__ = [
     'find_class_boundaries',
     'extract_all_fields',
+    'extract_fields_from_lines',
     'extract_public_fields',
     'main'
 ]
@@ -456,29 +456,14 @@ try:
                         springbootplusplus_data_scripts_dir = library_scripts_dir
                     sys.path.insert(0, str(springbootplusplus_data_scripts_dir))
                     
-                    from springbootplusplus_data_core.repository.process_repository import process_repository
+                    from springbootplusplus_data_core.repository.process_repository import process_repositories
                     
-                    processed_count = 0
-                    implemented_count = 0
+                    # Process each file for repository implementation: detect @Repository annotation,
+                    # create impl file, and add include (files without a repository are remembered
+                    # in the project's cache and skipped while unchanged)
+                    implemented_count = process_repositories(all_header_files, str(library_dir), dry_run=False, project_dir=project_dir)
                     
-                    for file_path in all_header_files:
-                        try:
-                            # Process file for repository implementation
-                            # This will detect @Repository annotation, create impl file, and add include
-                            result = process_repository(str(file_path), str(library_dir), dry_run=False)
-                            if result:
-                                # print(f"  ✓ Repository implementation generated for: {file_path}")
-                                implemented_count += 1
-                            else:
-                                # print(f"  - No repository found in: {file_path}")
-                                pass
-                            processed_count += 1
-                        except Exception as e:
-                            # print(f"⚠️  Warning: Error processing {file_path}: {e}")
-                            import traceback
-                            traceback.print_exc()
-                    
-                    # print(f"\n✅ Processed {processed_count} file(s), implemented {implemented_count} repository(ies)")
+                    # print(f"\n✅ Processed {len(all_header_files)} file(s), implemented {implemented_count} repository(ies)")
                     
                 except ImportError as e:
                     # print(f"⚠️  Warning: Could not import implement_repository: {e}")